@@ -1,27 +1,21 @@
 """The Ship24 integration."""
 
+import functools
 import logging
-from typing import Any
+from contextlib import suppress
 
+import orjson
 from aiohttp import web
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import aiohttp_client, config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
 _LOGGER = logging.getLogger(__name__)
 
-# Import webhook components
-try:
-    from homeassistant.components.webhook import async_register, async_unregister
-    WEBHOOK_AVAILABLE = True
-except ImportError:
-    async_register = None
-    async_unregister = None
-    WEBHOOK_AVAILABLE = False
-    _LOGGER.warning("Webhook component not available - webhook functionality will be disabled")
+from homeassistant.components.webhook import async_register, async_unregister
 
 from .app.api import ParcelTrackingAPI
 from .const import (
@@ -35,15 +29,151 @@ from .coordinator import Ship24DataUpdateCoordinator
 from .ship24.adapter import Ship24Adapter, Ship24Backend
 from .ship24.client import Ship24Client
 
+# Config entries carry their coordinator directly; hass.data only holds the
+# webhook-ID index shared across entries
+Ship24ConfigEntry = ConfigEntry[Ship24DataUpdateCoordinator]
+
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON]
 
+# aiohttp responses are single-use once prepared, so cache the encoded
+# bodies for the hot paths instead of Response objects themselves
+_OK_BODY = b"OK"
+_NOT_FOUND_BODY = b"Webhook not found"
+_BAD_PAYLOAD_BODY = b"Invalid payload"
+
+
+def _response_ok() -> web.Response:
+    """Return a 200 OK response without re-encoding the body."""
+    return web.Response(status=200, body=_OK_BODY)
+
+
+# Markers in the ValueError raised when a webhook ID is already registered
+_ALREADY_REGISTERED_MARKERS = ("already defined", "already registered")
+
+# Private IP ranges Ship24's servers cannot reach from the internet
+_INTERNAL_PREFIXES = (
+    "http://172.",
+    "http://192.168.",
+    "http://10.",
+    "http://127.",
+    "http://169.254.",
+)
+
 # Config schema - this integration only uses config flow
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
+async def _async_log_webhook_url(hass: HomeAssistant, webhook_id: str) -> None:
+    """Display webhook URL for manual configuration in Ship24 dashboard."""
+    try:
+        from homeassistant.helpers import network
+        webhook_base_url = network.get_url(hass, prefer_external=True, allow_cloud=False)
+        if webhook_base_url:
+            webhook_full_url = f"{webhook_base_url.rstrip('/')}/api/webhook/{webhook_id}"
+
+            # Check if URL appears to be internal (private IP ranges)
+            is_internal = webhook_base_url.startswith(_INTERNAL_PREFIXES)
+
+            if is_internal:
+                _LOGGER.warning(
+                    "Webhook URL appears to be an internal IP address: %s\n"
+                    "Ship24's servers cannot reach internal IPs from the internet.\n"
+                    "Please configure an external URL in Home Assistant settings:\n"
+                    "  Settings > System > Network > External URL\n"
+                    "Then configure this webhook URL in your Ship24 dashboard.",
+                    webhook_full_url
+                )
+            else:
+                _LOGGER.info(
+                    "Webhook handler is ready. To enable webhook updates from Ship24:\n"
+                    "1. Copy this webhook URL: %s\n"
+                    "2. Go to your Ship24 dashboard\n"
+                    "3. Navigate to Settings > Webhooks\n"
+                    "4. Paste the webhook URL and save\n"
+                    "The integration will use polling until the webhook is configured.",
+                    webhook_full_url
+                )
+        else:
+            _LOGGER.warning(
+                "No external URL configured. Webhook URL cannot be generated.\n"
+                "Please set up an external URL in: Settings > System > Network > External URL\n"
+                "Then configure the webhook URL in your Ship24 dashboard."
+            )
+    except Exception as err:
+        _LOGGER.error(
+            "Failed to generate webhook URL: %s\n"
+            "The webhook handler is registered locally, but the webhook URL could not be determined.",
+            err
+        )
+
+
+def _resolve_coordinator(hass: HomeAssistant, call) -> Ship24DataUpdateCoordinator | None:
+    """Resolve the coordinator for a service call.
+
+    Uses call.data["entry_id"] when provided, otherwise the first loaded entry.
+    """
+    entry_id = call.data.get("entry_id")
+    if entry_id:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        return getattr(entry, "runtime_data", None) if entry else None
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        coordinator = getattr(entry, "runtime_data", None)
+        if coordinator is not None:
+            return coordinator
+    return None
+
+
+async def async_add_tracking(hass: HomeAssistant, call) -> None:
+    """Handle add_tracking service call."""
+    tracking_number = call.data.get("tracking_number")
+    custom_name = call.data.get("custom_name")
+    if not tracking_number:
+        _LOGGER.error("tracking_number is required")
+        return
+
+    coordinator = _resolve_coordinator(hass, call)
+    if coordinator is None:
+        _LOGGER.error("No Ship24 config entry is loaded")
+        return
+
+    success = await coordinator.async_add_tracking(tracking_number, custom_name)
+    if success:
+        _LOGGER.info("Added tracking: %s", tracking_number)
+    else:
+        _LOGGER.error("Failed to add tracking: %s", tracking_number)
+
+
+async def async_remove_tracking(hass: HomeAssistant, call) -> None:
+    """Handle remove_tracking service call."""
+    tracking_number = call.data.get("tracking_number")
+    if not tracking_number:
+        _LOGGER.error("tracking_number is required")
+        return
+
+    coordinator = _resolve_coordinator(hass, call)
+    if coordinator is None:
+        _LOGGER.error("No Ship24 config entry is loaded")
+        return
+
+    success = await coordinator.async_remove_tracking(tracking_number)
+    if success:
+        _LOGGER.info("Removed tracking: %s", tracking_number)
+    else:
+        _LOGGER.error("Failed to remove tracking: %s", tracking_number)
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Ship24 component."""
     hass.data.setdefault(DOMAIN, {})
+
+    # Register services once for the component, not per config entry
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_TRACKING, functools.partial(async_add_tracking, hass)
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REMOVE_TRACKING, functools.partial(async_remove_tracking, hass)
+    )
+
     return True
 
 
@@ -52,8 +182,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     api_key = entry.data[CONF_API_KEY]
     webhook_id = entry.data.get(CONF_WEBHOOK_ID)
 
-    # Initialize Ship24 layers
-    client = Ship24Client(api_key)
+    # Initialize Ship24 layers - share HA's pooled aiohttp session so requests
+    # reuse connections instead of paying TCP/TLS setup per call. One client
+    # per API key is shared across entries so they also share its caches
+    clients = hass.data.setdefault(DOMAIN, {}).setdefault("_clients", {})
+    client = clients.get(api_key)
+    if client is None:
+        client = Ship24Client(
+            api_key, session=aiohttp_client.async_get_clientsession(hass)
+        )
+        clients[api_key] = client
     adapter = Ship24Adapter()
     backend = Ship24Backend(client, adapter)
     api = ParcelTrackingAPI(backend)
@@ -61,114 +199,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create coordinator with entry for persistence
     coordinator = Ship24DataUpdateCoordinator(hass, api, entry)
 
-    # Store in hass data
-    hass.data[DOMAIN][entry.entry_id] = {
-        "coordinator": coordinator,
-        "api": api,
-        "client": client,
-    }
+    # Single attribute access for platforms instead of the hass.data chain
+    entry.runtime_data = coordinator
 
     # Register webhook handler if webhook_id is available
-    if webhook_id and WEBHOOK_AVAILABLE:
+    if webhook_id:
         try:
             async_register(
                 hass,
                 domain=DOMAIN,
                 name=f"Ship24 {entry.title}",
                 webhook_id=webhook_id,
-                handler=async_handle_webhook,
+                # Bind this entry's coordinator so the handler skips the
+                # entry lookup on every delivery
+                handler=functools.partial(
+                    async_handle_webhook, coordinator=coordinator
+                ),
             )
             _LOGGER.info("Registered webhook handler with ID: %s", webhook_id)
-            
-            # Display webhook URL for manual configuration in Ship24 dashboard
-            try:
-                from homeassistant.helpers import network
-                webhook_base_url = network.get_url(hass, prefer_external=True, allow_cloud=False)
-                if webhook_base_url:
-                    webhook_full_url = f"{webhook_base_url.rstrip('/')}/api/webhook/{webhook_id}"
-                    
-                    # Check if URL appears to be internal (private IP ranges)
-                    is_internal = False
-                    if webhook_base_url.startswith("http://172.") or webhook_base_url.startswith("http://192.168.") or webhook_base_url.startswith("http://10.") or webhook_base_url.startswith("http://127.") or webhook_base_url.startswith("http://169.254."):
-                        is_internal = True
-                    
-                    if is_internal:
-                        _LOGGER.warning(
-                            "Webhook URL appears to be an internal IP address: %s\n"
-                            "Ship24's servers cannot reach internal IPs from the internet.\n"
-                            "Please configure an external URL in Home Assistant settings:\n"
-                            "  Settings > System > Network > External URL\n"
-                            "Then configure this webhook URL in your Ship24 dashboard.",
-                            webhook_full_url
-                        )
-                    else:
-                        _LOGGER.info(
-                            "Webhook handler is ready. To enable webhook updates from Ship24:\n"
-                            "1. Copy this webhook URL: %s\n"
-                            "2. Go to your Ship24 dashboard\n"
-                            "3. Navigate to Settings > Webhooks\n"
-                            "4. Paste the webhook URL and save\n"
-                            "The integration will use polling until the webhook is configured.",
-                            webhook_full_url
-                        )
-                else:
-                    _LOGGER.warning(
-                        "No external URL configured. Webhook URL cannot be generated.\n"
-                        "Please set up an external URL in: Settings > System > Network > External URL\n"
-                        "Then configure the webhook URL in your Ship24 dashboard."
-                    )
-            except Exception as err:
-                _LOGGER.error(
-                    "Failed to generate webhook URL: %s\n"
-                    "The webhook handler is registered locally, but the webhook URL could not be determined.",
-                    err
-                )
+            # Index webhook ID -> entry ID for O(1) lookup in the webhook handler
+            hass.data[DOMAIN].setdefault("_webhook_index", {})[webhook_id] = entry.entry_id
+
+            # Advisory webhook-URL logging happens off the setup critical path
+            entry.async_create_background_task(
+                hass,
+                _async_log_webhook_url(hass, webhook_id),
+                name="ship24-webhook-url",
+            )
         except ValueError as err:
             # ValueError is raised when webhook is already registered
-            if "already defined" in str(err).lower() or "already registered" in str(err).lower():
+            msg = str(err).lower()
+            if any(marker in msg for marker in _ALREADY_REGISTERED_MARKERS):
                 _LOGGER.debug("Webhook %s is already registered, skipping", webhook_id)
             else:
                 _LOGGER.error("Failed to register webhook handler: %s", err)
         except Exception as err:
             _LOGGER.error("Failed to register webhook handler: %s", err)
-    elif webhook_id and not WEBHOOK_AVAILABLE:
-        _LOGGER.warning("Webhook ID provided but webhook component is not available")
 
     # Forward entry setup to platforms (this will call async_setup_entry in sensor.py)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
     # Note: async_config_entry_first_refresh is called in sensor.py after entities are set up
-
-    # Register services
-    async def async_add_tracking(call) -> None:
-        """Handle add_tracking service call."""
-        tracking_number = call.data.get("tracking_number")
-        custom_name = call.data.get("custom_name")
-        if not tracking_number:
-            _LOGGER.error("tracking_number is required")
-            return
-
-        success = await coordinator.async_add_tracking(tracking_number, custom_name)
-        if success:
-            _LOGGER.info("Added tracking: %s", tracking_number)
-        else:
-            _LOGGER.error("Failed to add tracking: %s", tracking_number)
-
-    async def async_remove_tracking(call) -> None:
-        """Handle remove_tracking service call."""
-        tracking_number = call.data.get("tracking_number")
-        if not tracking_number:
-            _LOGGER.error("tracking_number is required")
-            return
-
-        success = await coordinator.async_remove_tracking(tracking_number)
-        if success:
-            _LOGGER.info("Removed tracking: %s", tracking_number)
-        else:
-            _LOGGER.error("Failed to remove tracking: %s", tracking_number)
-
-    hass.services.async_register(DOMAIN, SERVICE_ADD_TRACKING, async_add_tracking)
-    hass.services.async_register(DOMAIN, SERVICE_REMOVE_TRACKING, async_remove_tracking)
+    # Services are registered once in async_setup
 
     # Initial data fetch will be triggered in sensor.py after entities are set up
     return True
@@ -182,108 +254,87 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Unregister webhook
         webhook_id = entry.data.get(CONF_WEBHOOK_ID)
         
-        if webhook_id and WEBHOOK_AVAILABLE:
-            try:
+        if webhook_id:
+            with suppress(Exception):
                 async_unregister(hass, webhook_id)
-            except Exception as err:
-                _LOGGER.warning("Failed to unregister webhook: %s", err)
+            hass.data[DOMAIN].get("_webhook_index", {}).pop(webhook_id, None)
 
         # Clean up
-        hass.data[DOMAIN].pop(entry.entry_id)
+        await entry.runtime_data.async_shutdown()
 
     return unload_ok
 
 
 async def async_handle_webhook(
-    hass: HomeAssistant, webhook_id: str, request: web.Request
+    hass: HomeAssistant,
+    webhook_id: str,
+    request: web.Request,
+    coordinator: Ship24DataUpdateCoordinator | None = None,
 ) -> web.Response:
     """Handle incoming webhook from Ship24.
     
     This handler receives POST requests from Ship24 when package tracking updates occur.
     The webhook_id matches the ID registered during setup.
     """
-    _LOGGER.info(
-        "Webhook handler called with ID: %s | Method: %s | Path: %s | Headers: %s",
-        webhook_id,
-        request.method,
-        request.path,
-        dict(request.headers)
-    )
-    try:
-        _LOGGER.debug("Received webhook: %s", webhook_id)
-
-        # Find the config entry for this webhook
-        entry = None
-        registered_ids = []
-        for config_entry in hass.config_entries.async_entries(DOMAIN):
-            stored_webhook_id = config_entry.data.get(CONF_WEBHOOK_ID)
-            if stored_webhook_id:
-                registered_ids.append(stored_webhook_id)
-            if stored_webhook_id == webhook_id:
-                entry = config_entry
-                _LOGGER.info("Found matching config entry for webhook ID: %s", webhook_id)
-                break
-
-        if registered_ids:
-            _LOGGER.debug("Registered webhook IDs: %s", registered_ids)
-
-        if not entry:
-            _LOGGER.warning("No config entry found for webhook ID: %s. Registered IDs: %s", webhook_id, registered_ids)
-            return web.Response(status=404, text="Webhook not found")
-
-        # Get coordinator and API
-        domain_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-        coordinator: Ship24DataUpdateCoordinator = domain_data.get("coordinator")
-        api: ParcelTrackingAPI = domain_data.get("api")
-
-        if not coordinator or not api:
-            _LOGGER.error("Coordinator or API not found for webhook")
-            return web.Response(status=500, text="Internal server error")
-
-        # Parse webhook payload
-        try:
-            payload = await request.json()
-            _LOGGER.info("Webhook payload received: %s", payload)
-        except Exception as err:
-            _LOGGER.error("Failed to parse webhook payload: %s", err)
-            # Try to read raw body for debugging
-            try:
-                body = await request.text()
-                _LOGGER.debug("Raw webhook body: %s", body)
-            except Exception:
-                pass
-            return web.Response(status=400, text="Invalid payload")
-
-        # Process webhook via App Layer
-        try:
-            _LOGGER.info("Processing webhook payload via API layer")
-            package = await api.process_webhook_payload(payload)
-            if package:
-                tracking_number = package.tracking_number
-                _LOGGER.info("Webhook processed successfully. Package tracking number: %s", tracking_number)
-                
-                # Only process webhook if this tracking number is being tracked in Home Assistant
-                tracked_numbers = coordinator.get_tracking_numbers()
-                _LOGGER.debug("Currently tracked packages: %s", tracked_numbers)
-                if tracking_number not in tracked_numbers:
-                    _LOGGER.info(
-                        "Webhook received for untracked package %s. Ignoring (not tracked in Home Assistant).",
-                        tracking_number
-                    )
-                    return web.Response(status=200, text="OK")  # Return OK to avoid retries
-                
-                _LOGGER.info("Webhook update received for tracked package: %s. Triggering refresh.", tracking_number)
-                # Trigger coordinator update to refresh the package
-                await coordinator.async_request_refresh()
-                _LOGGER.info("Coordinator refresh triggered successfully")
-                return web.Response(status=200, text="OK")
-            else:
-                _LOGGER.warning("Failed to process webhook payload - package is None")
-                return web.Response(status=200, text="OK")  # Return OK even if processing failed to avoid retries
-        except Exception as err:
-            _LOGGER.exception("Error processing webhook payload: %s", err)
-            return web.Response(status=500, text="Error processing webhook")
-    except Exception as err:
-        _LOGGER.exception("Unexpected error in webhook handler: %s", err)
+    # Gate on isEnabledFor so the headers dict is never materialized unless
+    # debug logging is actually on - this runs on every webhook POST
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Webhook handler called with ID: %s | Method: %s | Path: %s | Headers: %s",
+            webhook_id,
+            request.method,
+            request.path,
+            dict(request.headers),
+        )
+    _LOGGER.debug("Received webhook: %s", webhook_id)
+
+    if coordinator is None:
+        # Fallback: look up the config entry via the index built at setup
+        webhook_index = hass.data.get(DOMAIN, {}).get("_webhook_index", {})
+        entry_id = webhook_index.get(webhook_id)
+        entry = hass.config_entries.async_get_entry(entry_id) if entry_id else None
+
+        if entry is None:
+            _LOGGER.warning(
+                "No config entry found for webhook ID: %s. Registered IDs: %s",
+                webhook_id,
+                list(webhook_index),
+            )
+            return web.Response(status=404, body=_NOT_FOUND_BODY)
+
+        coordinator = getattr(entry, "runtime_data", None)
+
+    if coordinator is None:
+        _LOGGER.error("Coordinator not found for webhook")
         return web.Response(status=500, text="Internal server error")
 
+    # Parse webhook payload
+    # Read the body once; the raw bytes double as debug output on failure
+    raw = await request.read()
+    try:
+        # orjson decodes the nested event arrays much faster than stdlib json
+        payload = orjson.loads(raw)
+        _LOGGER.debug("Webhook payload received: %s", payload)
+    except orjson.JSONDecodeError as err:
+        _LOGGER.error("Failed to parse webhook payload: %s", err)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            # Bounded slice avoids logging megabytes on malformed input
+            _LOGGER.debug("Raw webhook body: %s", raw[:4096])
+        return web.Response(status=400, body=_BAD_PAYLOAD_BODY)
+
+    # Short-circuit duplicate deliveries (Ship24 retries) before any work
+    event_id = (payload.get("event") or {}).get("eventId") if isinstance(payload, dict) else None
+    if event_id and coordinator.is_duplicate_webhook_event(event_id):
+        _LOGGER.debug("Duplicate webhook event %s, skipping", event_id)
+        return _response_ok()
+
+    # Hand the payload(s) to the coordinator's queue-backed consumer so the
+    # HTTP response returns immediately; the consumer batches processing and
+    # fires a single debounced refresh for tracked packages
+    _LOGGER.debug("Queueing webhook payload for background processing")
+    if isinstance(payload, list):
+        for item in payload:
+            coordinator.async_enqueue_webhook(item)
+    else:
+        coordinator.async_enqueue_webhook(payload)
+    return _response_ok()
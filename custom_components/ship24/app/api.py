@@ -1,9 +1,16 @@
 """Platform-agnostic API interface for package tracking."""
 
+import asyncio
+import logging
 from typing import List, Optional
 
 from .models import PackageData
 
+_LOGGER = logging.getLogger(__name__)
+
+# Cap on concurrent backend fetches to avoid hammering the Ship24 API
+MAX_CONCURRENT_FETCHES = 10
+
 
 class ParcelTrackingAPI:
     """Platform-agnostic API for package tracking."""
@@ -46,10 +53,11 @@ class ParcelTrackingAPI:
         Returns:
             PackageData object or None if not found
         """
-        # Check cache first
-        if tracking_number in self._packages:
-            return self._packages[tracking_number]
-        
+        # Check cache first (single lookup)
+        package_data = self._packages.get(tracking_number)
+        if package_data is not None:
+            return package_data
+
         # Fetch from backend
         package_data = await self._backend.get_tracker(tracking_number)
         if package_data:
@@ -60,16 +68,53 @@ class ParcelTrackingAPI:
     async def get_all_packages(self) -> List[PackageData]:
         """Get all tracked packages.
 
+        Fetches run concurrently (bounded by a semaphore) so total wall time
+        is ~one round trip instead of one per tracker.
+
         Returns:
             List of PackageData objects
         """
-        # Refresh all packages from backend
+        tracking_numbers = tuple(self._packages)
+        if not tracking_numbers:
+            return []
+
+        # Bulk fast path: one HTTP request for all trackers instead of N
+        if hasattr(self._backend, "get_trackers"):
+            try:
+                fetched = await self._backend.get_trackers(tracking_numbers)
+            except Exception as err:
+                _LOGGER.warning(
+                    "Bulk tracker fetch failed, falling back to per-tracker fetches: %s",
+                    err,
+                )
+            else:
+                packages = []
+                for package in fetched:
+                    cached = self._packages.get(package.tracking_number)
+                    if cached:
+                        package.custom_name = cached.custom_name
+                    self._packages[package.tracking_number] = package
+                    packages.append(package)
+                return packages
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(tracking_number: str) -> Optional[PackageData]:
+            async with semaphore:
+                return await self.get_package(tracking_number)
+
+        results = await asyncio.gather(
+            *(fetch(tn) for tn in tracking_numbers), return_exceptions=True
+        )
+
         packages = []
-        for tracking_number in list(self._packages.keys()):
-            package = await self.get_package(tracking_number)
-            if package:
-                packages.append(package)
-        
+        for tracking_number, result in zip(tracking_numbers, results):
+            if isinstance(result, BaseException):
+                _LOGGER.error("Failed to fetch package %s: %s", tracking_number, result)
+                continue
+            if result:
+                packages.append(result)
+
         return packages
 
     async def remove_tracking(self, tracking_number: str) -> bool:
@@ -84,11 +129,8 @@ class ParcelTrackingAPI:
         Returns:
             True if removed, False if not found
         """
-        if tracking_number in self._packages:
-            # Don't delete from Ship24, just remove from our tracking
-            del self._packages[tracking_number]
-            return True
-        return False
+        # Don't delete from Ship24, just remove from our tracking
+        return self._packages.pop(tracking_number, None) is not None
 
     async def update_package(self, tracking_number: str) -> Optional[PackageData]:
         """Refresh package data from backend.
@@ -99,14 +141,51 @@ class ParcelTrackingAPI:
         Returns:
             Updated PackageData object or None if not found
         """
-        package_data = await self._backend.get_tracker(tracking_number)
-        if package_data:
-            # Preserve custom name if it exists
-            if tracking_number in self._packages:
-                package_data.custom_name = self._packages[tracking_number].custom_name
-            self._packages[tracking_number] = package_data
+        cached = self._packages.get(tracking_number)
+        if_newer_than = cached.last_update if cached is not None else None
+        package_data = await self._backend.get_tracker(
+            tracking_number, if_newer_than=if_newer_than
+        )
+        if package_data is None:
+            # Unchanged since the cached snapshot (or the fetch failed):
+            # keep the cached package and its serialized dict
+            return cached
+        # Preserve custom name if it exists
+        if cached is not None:
+            package_data.custom_name = cached.custom_name
+        self._packages[tracking_number] = package_data
         return package_data
 
+    async def update_packages(
+        self, tracking_numbers: List[str]
+    ) -> Optional[dict[str, PackageData]]:
+        """Refresh several packages with a single backend request.
+
+        Collapses N per-tracker round trips into one bulk call when the
+        backend supports it; errors propagate so callers can fall back to
+        per-tracker updates.
+
+        Args:
+            tracking_numbers: The tracking numbers to refresh
+
+        Returns:
+            Mapping of tracking number to PackageData, or None when the
+            backend has no bulk support
+        """
+        if not tracking_numbers or not hasattr(self._backend, "get_trackers"):
+            return None
+
+        fetched = await self._backend.get_trackers(tracking_numbers)
+        packages: dict[str, PackageData] = {}
+        for package in fetched:
+            # Preserve custom name if it exists
+            cached = self._packages.get(package.tracking_number)
+            if cached is not None:
+                package.custom_name = cached.custom_name
+            self._packages[package.tracking_number] = package
+            packages[package.tracking_number] = package
+        return packages
+
     async def process_webhook_payload(self, payload: dict) -> Optional[PackageData]:
         """Process incoming webhook payload.
 
@@ -120,13 +199,49 @@ class ParcelTrackingAPI:
         package_data = await self._backend.process_webhook(payload)
         if package_data:
             # Preserve custom name if it exists
-            if package_data.tracking_number in self._packages:
-                package_data.custom_name = (
-                    self._packages[package_data.tracking_number].custom_name
-                )
+            cached = self._packages.get(package_data.tracking_number)
+            if cached is not None:
+                package_data.custom_name = cached.custom_name
             self._packages[package_data.tracking_number] = package_data
         return package_data
 
+    async def process_webhook_batch(self, payloads: List[dict]) -> List[PackageData]:
+        """Process a batch of webhook payloads in one pass.
+
+        Payloads are parsed concurrently, duplicate tracking numbers coalesce
+        (latest wins) and the cache is written once per package.
+
+        Args:
+            payloads: The webhook payloads from the backend
+
+        Returns:
+            List of updated PackageData objects
+        """
+        if not payloads:
+            return []
+
+        results = await asyncio.gather(
+            *(self._backend.process_webhook(payload) for payload in payloads),
+            return_exceptions=True,
+        )
+
+        latest: dict[str, PackageData] = {}
+        for result in results:
+            if isinstance(result, BaseException):
+                _LOGGER.error("Failed to process webhook payload: %s", result)
+                continue
+            if result:
+                latest[result.tracking_number] = result
+
+        for tracking_number, package in latest.items():
+            # Preserve custom name if it exists
+            cached = self._packages.get(tracking_number)
+            if cached is not None:
+                package.custom_name = cached.custom_name
+            self._packages[tracking_number] = package
+
+        return list(latest.values())
+
     def set_custom_name(self, tracking_number: str, custom_name: Optional[str]) -> bool:
         """Set or update custom name for a package.
 
@@ -137,8 +252,10 @@ class ParcelTrackingAPI:
         Returns:
             True if package exists, False otherwise
         """
-        if tracking_number in self._packages:
-            self._packages[tracking_number].custom_name = custom_name
-            return True
-        return False
+        package = self._packages.get(tracking_number)
+        if package is None:
+            return False
+        package.custom_name = custom_name
+        package.invalidate_cache()
+        return True
 
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackingEvent:
     """Represents a single tracking event."""
 
@@ -17,9 +17,15 @@ class TrackingEvent:
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     raw_data: Dict[str, Any] = field(default_factory=dict)
+    timestamp_iso: str = ""
 
+    def __post_init__(self) -> None:
+        """Precompute the isoformat string; events are immutable after parsing."""
+        if not self.timestamp_iso and self.timestamp:
+            self.timestamp_iso = self.timestamp.isoformat()
 
-@dataclass
+
+@dataclass(slots=True)
 class PackageData:
     """Standardized package data model - platform-agnostic."""
 
@@ -37,9 +43,37 @@ class PackageData:
     custom_name: Optional[str] = None
     tracker_id: Optional[str] = None
     raw_data: Dict[str, Any] = field(default_factory=dict)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached dictionary after mutating the package."""
+        self._dict_cache = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for entity attributes."""
+        """Convert to dictionary for entity attributes.
+
+        The result is cached; callers mutating the package must call
+        invalidate_cache() so the next read rebuilds it.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the attribute dictionary from current field values."""
+        loc = self.location
+        events_list = [
+            {
+                "timestamp": event.timestamp_iso,
+                "location": event.location,
+                "status": event.status,
+                "status_text": event.status_text,
+                "description": event.description,
+                "latitude": event.latitude,
+                "longitude": event.longitude,
+            }
+            for event in self.events
+        ]
         return {
             "tracking_number": self.tracking_number,
             "status": self.status,
@@ -50,23 +84,12 @@ class PackageData:
             "estimated_delivery": (
                 self.estimated_delivery.isoformat() if self.estimated_delivery else None
             ),
-            "location": self.location,
+            "location": loc,
             "latitude": self.latitude,
             "longitude": self.longitude,
-            "location_text": self.location,
-            "events": [
-                {
-                    "timestamp": event.timestamp.isoformat(),
-                    "location": event.location,
-                    "status": event.status,
-                    "status_text": event.status_text,
-                    "description": event.description,
-                    "latitude": event.latitude,
-                    "longitude": event.longitude,
-                }
-                for event in self.events
-            ],
-            "event_count": len(self.events),
+            "location_text": loc,
+            "events": events_list,
+            "event_count": len(events_list),
             "custom_name": self.custom_name,
             "tracker_id": self.tracker_id,
         }
@@ -11,10 +11,34 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DEVICE_IDENTIFIER, DEVICE_NAME, DOMAIN, CONF_WEBHOOK_ID
-from .coordinator import Ship24DataUpdateCoordinator
+from .coordinator import RETRYABLE_ERROR_RE, Ship24DataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Cache for the lazily imported sensor class so repeated presses skip the
+# import machinery
+_SENSOR_CLS = None
+
+
+def _get_sensor_cls():
+    """Return Ship24PackageSensor, importing it on first use."""
+    global _SENSOR_CLS
+    if _SENSOR_CLS is None:
+        # Import here to avoid circular imports
+        from .sensor import Ship24PackageSensor
+
+        _SENSOR_CLS = Ship24PackageSensor
+    return _SENSOR_CLS
+
+
+# All Ship24 entities share one device; build the DeviceInfo once
+_DEVICE_INFO = DeviceInfo(
+    identifiers={DEVICE_IDENTIFIER},
+    name=DEVICE_NAME,
+    manufacturer="Ship24",
+    model="Package Tracking",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -22,9 +46,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Ship24 button from a config entry."""
-    coordinator: Ship24DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
+    coordinator: Ship24DataUpdateCoordinator = entry.runtime_data
 
     # Get the async_add_sensor callback from coordinator if available
     async_add_sensor = getattr(coordinator, "_async_add_entities", None)
@@ -43,6 +65,7 @@ class Ship24GetWebhookButton(CoordinatorEntity, ButtonEntity):
     _attr_has_entity_name = True
     _attr_unique_id = f"{DOMAIN}_get_webhook"
     _attr_name = "Get Webhook URL"
+    _attr_icon = "mdi:webhook"
 
     def __init__(self, coordinator: Ship24DataUpdateCoordinator) -> None:
         """Initialize the get webhook button."""
@@ -51,17 +74,7 @@ class Ship24GetWebhookButton(CoordinatorEntity, ButtonEntity):
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
-        return DeviceInfo(
-            identifiers={DEVICE_IDENTIFIER},
-            name=DEVICE_NAME,
-            manufacturer="Ship24",
-            model="Package Tracking",
-        )
-
-    @property
-    def icon(self) -> str:
-        """Return the icon for the button."""
-        return "mdi:webhook"
+        return _DEVICE_INFO
 
     async def async_press(self) -> None:
         """Handle the button press - get the webhook URL."""
@@ -69,16 +82,13 @@ class Ship24GetWebhookButton(CoordinatorEntity, ButtonEntity):
         
         # Get the webhook ID
         webhook_id = self.coordinator.entry.data.get(CONF_WEBHOOK_ID)
-        
-        # Construct the full webhook URL (same logic as in __init__.py)
-        webhook_url = None
+
+        # The coordinator caches the URL; presses are an attribute read until
+        # the external URL actually changes
         if webhook_id:
             try:
-                from homeassistant.helpers import network
-                webhook_base_url = network.get_url(self.coordinator.hass, prefer_external=True, allow_cloud=False)
-                if webhook_base_url:
-                    webhook_url = f"{webhook_base_url.rstrip('/')}/api/webhook/{webhook_id}"
-                else:
+                webhook_url = self.coordinator.webhook_url
+                if not webhook_url:
                     webhook_url = f"Webhook ID: {webhook_id} (No external URL configured)"
             except Exception as err:
                 _LOGGER.error("Failed to construct webhook URL: %s", err)
@@ -102,6 +112,7 @@ class Ship24RefreshButton(CoordinatorEntity, ButtonEntity):
     _attr_has_entity_name = True
     _attr_unique_id = f"{DOMAIN}_refresh"
     _attr_name = "Refresh All"
+    _attr_icon = "mdi:refresh"
 
     def __init__(
         self, coordinator: Ship24DataUpdateCoordinator, async_add_sensor_callback
@@ -113,17 +124,7 @@ class Ship24RefreshButton(CoordinatorEntity, ButtonEntity):
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
-        return DeviceInfo(
-            identifiers={DEVICE_IDENTIFIER},
-            name=DEVICE_NAME,
-            manufacturer="Ship24",
-            model="Package Tracking",
-        )
-
-    @property
-    def icon(self) -> str:
-        """Return the icon for the button."""
-        return "mdi:refresh"
+        return _DEVICE_INFO
 
     async def async_press(self) -> None:
         """Handle the button press - refresh all tracking sensors."""
@@ -133,8 +134,7 @@ class Ship24RefreshButton(CoordinatorEntity, ButtonEntity):
             # Refresh coordinator data
             await self.coordinator.async_request_refresh()
         except Exception as err:
-            error_str = str(err).lower()
-            if any(keyword in error_str for keyword in ['timeout', 'dns', 'connection', 'network']):
+            if RETRYABLE_ERROR_RE.search(str(err)):
                 _LOGGER.warning(
                     "Refresh failed due to network issue: %s. Will retry automatically.",
                     err
@@ -147,17 +147,26 @@ class Ship24RefreshButton(CoordinatorEntity, ButtonEntity):
         if self._async_add_sensor:
             tracked_numbers = self.coordinator.get_tracking_numbers()
             entity_registry = er.async_get(self.coordinator.hass)
-            
-            for tracking_number in tracked_numbers:
-                unique_id = f"{DOMAIN}_{tracking_number}"
-                entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
-                if not entity_id:
-                    # Sensor missing, create it
-                    _LOGGER.info("Creating missing sensor for %s", tracking_number)
-                    # Import here to avoid circular imports
-                    from .sensor import Ship24PackageSensor
-                    sensor = Ship24PackageSensor(self.coordinator, tracking_number)
-                    self._async_add_sensor([sensor])
+
+            # Snapshot existing sensor unique IDs once instead of a registry
+            # lookup per tracking number
+            existing = {
+                entity_entry.unique_id
+                for entity_entry in entity_registry.entities.values()
+                if entity_entry.domain == "sensor" and entity_entry.platform == DOMAIN
+            }
+
+            # One add_entities call for all missing sensors instead of one
+            # platform round trip per sensor
+            sensor_cls = _get_sensor_cls()
+            new_sensors = [
+                sensor_cls(self.coordinator, tracking_number)
+                for tracking_number in tracked_numbers
+                if f"{DOMAIN}_{tracking_number}" not in existing
+            ]
+            if new_sensors:
+                _LOGGER.info("Creating %d missing sensors", len(new_sensors))
+                self._async_add_sensor(new_sensors)
 
         #note: The coordinator will update _last_message with refresh results
         # via _async_update_data(), so we don't need to set it here
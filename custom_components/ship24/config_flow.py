@@ -10,6 +10,7 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import CONF_API_KEY, CONF_WEBHOOK_ID, DOMAIN
 
@@ -26,13 +27,12 @@ async def validate_api_key(hass: HomeAssistant, api_key: str) -> None:
     """Validate the API key by testing connection."""
     # Import here to avoid circular imports
     from .ship24.client import Ship24Client
-    import aiohttp
-    
-    async with aiohttp.ClientSession() as session:
-        client = Ship24Client(api_key, session)
-        is_valid = await client.test_connection()
-        if not is_valid:
-            raise InvalidApiKey
+
+    # Reuse HA's pooled session instead of paying a TLS handshake per attempt
+    client = Ship24Client(api_key, async_get_clientsession(hass))
+    is_valid = await client.test_connection()
+    if not is_valid:
+        raise InvalidApiKey
 
 
 class InvalidApiKey(HomeAssistantError):
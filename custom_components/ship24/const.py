@@ -1,5 +1,7 @@
 """Constants for the Ship24 integration."""
 
+import sys
+
 DOMAIN = "ship24"
 INTEGRATION_NAME = "Ship24 Package Tracking"
 DEVICE_NAME = "Ship24Tracking"
@@ -19,19 +21,22 @@ CONF_TRACKING_NUMBERS = "tracking_numbers"
 DEFAULT_UPDATE_INTERVAL = 4 * 60 * 60  # 4 hours
 WEBHOOK_UPDATE_INTERVAL = 1 * 60 * 60  # 1 hour (fallback polling)
 
+# Cap on concurrent update requests per refresh to stay under Ship24 rate limits
+MAX_CONCURRENT_REQUESTS = 5
+
 # Entity attributes
-ATTR_TRACKING_NUMBER = "tracking_number"
-ATTR_CARRIER = "carrier"
-ATTR_STATUS = "status"
-ATTR_STATUS_TEXT = "status_text"
-ATTR_LAST_UPDATE = "last_update"
-ATTR_ESTIMATED_DELIVERY = "estimated_delivery"
-ATTR_LOCATION = "location"
-ATTR_LOCATION_TEXT = "location_text"
-ATTR_EVENTS = "events"
-ATTR_EVENT_COUNT = "event_count"
-ATTR_CUSTOM_NAME = "custom_name"
-ATTR_TRACKER_ID = "tracker_id"
+ATTR_TRACKING_NUMBER = sys.intern("tracking_number")
+ATTR_CARRIER = sys.intern("carrier")
+ATTR_STATUS = sys.intern("status")
+ATTR_STATUS_TEXT = sys.intern("status_text")
+ATTR_LAST_UPDATE = sys.intern("last_update")
+ATTR_ESTIMATED_DELIVERY = sys.intern("estimated_delivery")
+ATTR_LOCATION = sys.intern("location")
+ATTR_LOCATION_TEXT = sys.intern("location_text")
+ATTR_EVENTS = sys.intern("events")
+ATTR_EVENT_COUNT = sys.intern("event_count")
+ATTR_CUSTOM_NAME = sys.intern("custom_name")
+ATTR_TRACKER_ID = sys.intern("tracker_id")
 
 # Service names
 SERVICE_ADD_TRACKING = "add_tracking"
@@ -42,10 +47,19 @@ CONF_API_KEY = "api_key"
 CONF_WEBHOOK_ID = "webhook_id"
 
 # Status codes (standardized)
-STATUS_PENDING = "pending"
-STATUS_IN_TRANSIT = "in_transit"
-STATUS_OUT_FOR_DELIVERY = "out_for_delivery"
-STATUS_DELIVERED = "delivered"
-STATUS_EXCEPTION = "exception"
-STATUS_UNKNOWN = "unknown"
+STATUS_PENDING = sys.intern("pending")
+STATUS_IN_TRANSIT = sys.intern("in_transit")
+STATUS_OUT_FOR_DELIVERY = sys.intern("out_for_delivery")
+STATUS_DELIVERED = sys.intern("delivered")
+STATUS_EXCEPTION = sys.intern("exception")
+STATUS_UNKNOWN = sys.intern("unknown")
 
+# Interning above makes these pointer-comparable; frozenset gives O(1) checks
+VALID_STATUSES = frozenset({
+    STATUS_PENDING,
+    STATUS_IN_TRANSIT,
+    STATUS_OUT_FOR_DELIVERY,
+    STATUS_DELIVERED,
+    STATUS_EXCEPTION,
+    STATUS_UNKNOWN,
+})
@@ -1,19 +1,67 @@
 """DataUpdateCoordinator for Ship24 integration."""
 
+import asyncio
 import logging
+import random
+import re
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import timedelta
+from time import monotonic
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import network
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from homeassistant.config_entries import ConfigEntry
 
 from .app.api import ParcelTrackingAPI
-from .const import CONF_TRACKING_NUMBERS, DEFAULT_UPDATE_INTERVAL, DOMAIN
+from .const import (
+    CONF_TRACKING_NUMBERS,
+    CONF_WEBHOOK_ID,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    STATUS_DELIVERED,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Cooldown window for coalescing bursts of webhook-triggered refreshes
+WEBHOOK_REFRESH_COOLDOWN = 2.0
+
+# Cooldown for coalescing listener fan-out from bursty updates
+LISTENER_UPDATE_COOLDOWN = 0.2
+
+# Dedup window for Ship24 webhook retries / duplicate deliveries
+RECENT_EVENT_TTL = 60.0
+RECENT_EVENT_MAX = 512
+
+# Bounds for the queue feeding the background webhook consumer
+WEBHOOK_QUEUE_MAX = 1000
+WEBHOOK_BATCH_MAX = 50
+
+# In-call retry policy for transient network errors during a refresh
+RETRY_MAX_ATTEMPTS = 3
+RETRY_MAX_SLEEP = 10.0
+
+# Poll rarely once every tracked parcel is delivered; nothing will change
+IDLE_UPDATE_INTERVAL = timedelta(hours=6)
+
+# Delay before flushing tracking-number changes to the config entry, so
+# scripted add/remove bursts serialize and write storage once
+SAVE_DEBOUNCE_DELAY = 0.5
+
+# Transient-error markers, compiled once; one pass over the message instead
+# of a substring scan per keyword
+RETRYABLE_ERROR_RE = re.compile(
+    r"timeout|dns|connection|network|resolve|cannot connect", re.IGNORECASE
+)
+
 
 class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Ship24 data."""
@@ -27,39 +75,203 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize coordinator."""
         self.api = api
-        self.hass = hass
         self.entry = entry
         self._tracking_numbers: set[str] = set()
+        self._configured_update_interval = timedelta(seconds=update_interval)
+        # Bound in-flight update requests so large parcel counts don't
+        # trip Ship24's server-side rate limiting
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         self._last_error: str | None = None
         self._last_message: str | None = None
+        # Entity-platform callbacks assigned by sensor.async_setup_entry;
+        # plain None defaults avoid hasattr checks on every service call
+        self._async_add_entities: AddEntitiesCallback | None = None
+        self._async_remove_entity: Callable[[str], None] | None = None
         
         # Load tracking numbers from config entry
         saved_tracking_numbers = entry.data.get(CONF_TRACKING_NUMBERS, [])
         if isinstance(saved_tracking_numbers, list):
             self._tracking_numbers = set(saved_tracking_numbers)
+        self._tracking_set: frozenset[str] = frozenset(self._tracking_numbers)
+        # Per-package change counters; sensors compare these to skip state
+        # writes when a refresh left their package untouched
+        self._versions: dict[str, int] = {}
+        # Recently processed webhook event keys -> monotonic timestamp (LRU)
+        self._recent_events: OrderedDict[str, float] = OrderedDict()
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=update_interval),
+            # Coalesce bursts of refresh requests (service calls, config
+            # flow, webhooks) into a single API fan-out
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=WEBHOOK_REFRESH_COOLDOWN,
+                immediate=False,
+            ),
+        )
+
+        # Coalesce listener fan-out when several updates land close together
+        self._listener_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=LISTENER_UPDATE_COOLDOWN,
+            immediate=False,
+            function=self._async_dispatch_listeners,
         )
 
+        # Queue + single consumer so webhook HTTP handlers return immediately
+        self._webhook_queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=WEBHOOK_QUEUE_MAX)
+        self._webhook_task: asyncio.Task | None = None
+
+        # Pending debounced config-entry save
+        self._save_handle: asyncio.TimerHandle | None = None
+
+        # Webhook URL is stable until the external URL changes; cache it and
+        # invalidate only when core config updates
+        self._webhook_url: str | None = None
+        self._unsub_core_config = hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, self._async_invalidate_webhook_url
+        )
+
+    @callback
+    def async_enqueue_webhook(self, payload: dict) -> bool:
+        """Queue a webhook payload for the background consumer.
+
+        Args:
+            payload: Parsed webhook payload
+
+        Returns:
+            False when the queue is full and the payload was dropped
+        """
+        if self._webhook_task is None or self._webhook_task.done():
+            self._webhook_task = self.hass.loop.create_task(
+                self._drain_webhook_queue()
+            )
+        try:
+            self._webhook_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            _LOGGER.warning("Webhook queue full, dropping payload")
+            return False
+        return True
+
+    async def _drain_webhook_queue(self) -> None:
+        """Consume queued webhook payloads in batches."""
+        while True:
+            batch = [await self._webhook_queue.get()]
+            while len(batch) < WEBHOOK_BATCH_MAX and not self._webhook_queue.empty():
+                batch.append(self._webhook_queue.get_nowait())
+            try:
+                packages = await self.api.process_webhook_batch(batch)
+            except Exception as err:
+                _LOGGER.error("Failed to process webhook batch: %s", err)
+                continue
+            if any(p.tracking_number in self._tracking_set for p in packages):
+                await self.async_request_webhook_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the webhook consumer and flush pending state before shutdown."""
+        if self._unsub_core_config is not None:
+            self._unsub_core_config()
+            self._unsub_core_config = None
+        if self._webhook_task is not None:
+            self._webhook_task.cancel()
+            self._webhook_task = None
+        # Flush any debounced config-entry save so changes aren't lost
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._do_save()
+        await super().async_shutdown()
+
+    @callback
+    def _async_invalidate_webhook_url(self, _event) -> None:
+        """Drop the cached webhook URL when core config changes."""
+        self._webhook_url = None
+
+    @property
+    def webhook_url(self) -> str | None:
+        """Return the full webhook URL, built once per config change."""
+        if self._webhook_url is None:
+            webhook_id = self.entry.data.get(CONF_WEBHOOK_ID)
+            if not webhook_id:
+                return None
+            base_url = network.get_url(self.hass, prefer_external=True, allow_cloud=False)
+            if not base_url:
+                return None
+            self._webhook_url = f"{base_url.rstrip('/')}/api/webhook/{webhook_id}"
+        return self._webhook_url
+
+    async def _async_dispatch_listeners(self) -> None:
+        """Fan out a listener update (debouncer target)."""
+        self.async_update_listeners()
+
+    async def async_schedule_update_listeners(self) -> None:
+        """Schedule a debounced listener update for non-urgent changes."""
+        await self._listener_debouncer.async_call()
+
+    async def async_request_webhook_refresh(self) -> None:
+        """Request a refresh, coalescing rapid webhook bursts into one fetch."""
+        await self.async_request_refresh()
+
+    def is_duplicate_webhook_event(self, event_key: str) -> bool:
+        """Check whether a webhook event was already processed recently.
+
+        Ship24 may retry deliveries or send duplicate events within seconds;
+        a small TTL-bounded LRU lets those short-circuit without a refresh.
+
+        Args:
+            event_key: Stable key identifying the event (e.g. its eventId)
+
+        Returns:
+            True if the event was seen within the dedup window
+        """
+        now = monotonic()
+        seen = self._recent_events.get(event_key)
+        if seen is not None and now - seen < RECENT_EVENT_TTL:
+            self._recent_events.move_to_end(event_key)
+            return True
+        self._recent_events[event_key] = now
+        self._recent_events.move_to_end(event_key)
+        while len(self._recent_events) > RECENT_EVENT_MAX:
+            self._recent_events.popitem(last=False)
+        return False
+
     def add_tracking_number(self, tracking_number: str) -> None:
         """Add a tracking number to be monitored."""
+        if tracking_number in self._tracking_numbers:
+            return
         self._tracking_numbers.add(tracking_number)
+        self._rebuild_tracking_set()
         self._save_tracking_numbers()
-        # Trigger immediate update
-        self.async_update_listeners()
+        # No listener notify here: callers that need fresh state request a
+        # refresh, which notifies once with the new data
 
     def remove_tracking_number(self, tracking_number: str) -> None:
         """Remove a tracking number from monitoring."""
+        if tracking_number not in self._tracking_numbers:
+            return
         self._tracking_numbers.discard(tracking_number)
+        self._rebuild_tracking_set()
         self._save_tracking_numbers()
 
-    def get_tracking_numbers(self) -> set[str]:
-        """Get all tracking numbers being monitored."""
-        return self._tracking_numbers.copy()
+    def _rebuild_tracking_set(self) -> None:
+        """Rebuild the cached frozenset after add/remove."""
+        self._tracking_set = frozenset(self._tracking_numbers)
+
+    @property
+    def tracking_set(self) -> frozenset[str]:
+        """Return the cached set of tracked numbers (no per-call copy)."""
+        return self._tracking_set
+
+    def get_tracking_numbers(self) -> frozenset[str]:
+        """Get all tracking numbers being monitored.
+
+        Returns the cached immutable view; no per-call copy.
+        """
+        return self._tracking_set
 
     def _is_retryable_error(self, err: Exception) -> bool:
         """Check if an error is retryable (transient network error).
@@ -70,25 +282,135 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
         Returns:
             True if the error is retryable, False otherwise
         """
-        error_str = str(err).lower()
-        retryable_keywords = ['timeout', 'dns', 'connection', 'network', 'resolve', 'cannot connect']
-        return any(keyword in error_str for keyword in retryable_keywords)
+        return bool(RETRYABLE_ERROR_RE.search(str(err)))
+
+    async def _call_with_retry(
+        self, coro_factory, tracking_number: str, max_attempts: int = RETRY_MAX_ATTEMPTS
+    ):
+        """Await a call, retrying transient failures with backoff and jitter.
+
+        Without this, a sub-second DNS or connection blip costs a whole
+        update_interval before the coordinator polls again.
+
+        Args:
+            coro_factory: Zero-argument callable returning a fresh coroutine
+            tracking_number: Tracking number, for log context
+            max_attempts: Total attempts including the first
+
+        Returns:
+            Whatever the underlying call returns
+        """
+        for attempt in range(max_attempts):
+            try:
+                return await coro_factory()
+            except Exception as err:
+                if attempt + 1 >= max_attempts or not self._is_retryable_error(err):
+                    raise
+                delay = min(2**attempt + random.random() * 0.3, RETRY_MAX_SLEEP)
+                _LOGGER.debug(
+                    "Transient error updating %s (attempt %d/%d), retrying in %.1fs: %s",
+                    tracking_number,
+                    attempt + 1,
+                    max_attempts,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+
+    def data_version(self, tracking_number: str) -> int:
+        """Return the change counter for a tracked package."""
+        return self._versions.get(tracking_number, 0)
+
+    def _note_changes(self, previous: dict[str, Any], packages: dict[str, Any]) -> None:
+        """Bump version counters for packages that changed or disappeared.
+
+        update_package returns the cached object when Ship24 reports no new
+        data, so an identity check is enough to detect real changes.
+        """
+        for tracking_number, package in packages.items():
+            if previous.get(tracking_number) is not package:
+                self._versions[tracking_number] = (
+                    self._versions.get(tracking_number, 0) + 1
+                )
+        for tracking_number in previous:
+            if tracking_number not in packages:
+                self._versions[tracking_number] = (
+                    self._versions.get(tracking_number, 0) + 1
+                )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from Ship24 API via App Layer."""
-        packages = {}
+        # Nothing to poll on fresh installs; skip all per-update bookkeeping
+        if not self._tracking_numbers:
+            self._last_message = "No packages tracked"
+            return {}
+
         error_count = 0
         retryable_error_count = 0
-        
-        for tracking_number in list(self._tracking_numbers):
-            try:
-                package = await self.api.update_package(tracking_number)
-                if package:
-                    packages[tracking_number] = package
-            except Exception as err:
+
+        # Immutable snapshot: cheaper than a list copy and safe against
+        # add/remove landing while the fan-out awaits
+        tracking_numbers = tuple(self._tracking_numbers)
+
+        # Delivered parcels never change again: carry their cached data
+        # forward and only poll the active ones
+        previous = self.data or {}
+        packages = {}
+        for tn in tracking_numbers:
+            pkg = previous.get(tn)
+            if pkg is not None and pkg.status == STATUS_DELIVERED:
+                packages[tn] = pkg
+        active = tuple(tn for tn in tracking_numbers if tn not in packages)
+
+        if not active:
+            # Everything is delivered; back off the poll dramatically
+            self.update_interval = IDLE_UPDATE_INTERVAL
+            self._last_message = f"{len(packages)} delivered, nothing to poll"
+            self._note_changes(previous, packages)
+            return packages
+        self.update_interval = self._configured_update_interval
+
+        # Prefer one batched request over N concurrent ones: fewer round
+        # trips, less API quota, no rate-limit pressure
+        try:
+            bulk = await self.api.update_packages(active)
+        except Exception as err:
+            _LOGGER.debug(
+                "Bulk update failed, falling back to per-package updates: %s", err
+            )
+        else:
+            if bulk is not None:
+                packages.update(bulk)
+                # A tracker omitted from the bulk response keeps its cached
+                # package, matching the per-tracker path where update_package
+                # returns the cached entry on a miss.
+                for tracking_number in active:
+                    if tracking_number not in packages and tracking_number in previous:
+                        packages[tracking_number] = previous[tracking_number]
+                self._last_message = f"{len(bulk)} success, 0 fails"
+                self._last_error = None
+                self._note_changes(previous, packages)
+                return packages
+
+        # Fan out the remaining updates concurrently: total wall time is
+        # roughly the slowest single call instead of the sum of all of them
+        async def _fetch(tn: str):
+            async with self._sem:
+                return await self._call_with_retry(
+                    lambda: self.api.update_package(tn), tn
+                )
+
+        results = await asyncio.gather(
+            *(_fetch(tn) for tn in active),
+            return_exceptions=True,
+        )
+
+        for tracking_number, result in zip(active, results):
+            if isinstance(result, BaseException):
+                err = result
                 error_count += 1
                 error_msg = f"Error updating {tracking_number}: {str(err)}"
-                
+
                 # Check if this is a retryable error
                 if self._is_retryable_error(err):
                     retryable_error_count += 1
@@ -99,14 +421,18 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
                     )
                 else:
                     _LOGGER.error(error_msg)
-                
+
                 self._last_error = error_msg
                 # Continue with other packages
                 continue
+            if result:
+                packages[tracking_number] = result
+
+        self._note_changes(previous, packages)
 
         # Update last message with full report
         success_count = len(packages)
-        
+
         if error_count == 0:
             # All success
             self._last_message = f"{success_count} success, 0 fails"
@@ -153,15 +479,15 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
                 was_new = tracking_number not in self._tracking_numbers
                 self.add_tracking_number(tracking_number)
                 # Create sensor entity if callback is available and this is a new package
-                if was_new and hasattr(self, "_async_add_entities"):
+                if was_new and self._async_add_entities is not None:
                     from .sensor import Ship24PackageSensor
                     sensor = Ship24PackageSensor(self, tracking_number)
                     self._async_add_entities([sensor])
                 
                 self._last_message = f"Added tracking: {tracking_number}"
                 self._last_error = None
-                self.async_update_listeners()  # Update logging sensor
-                
+                # The refresh notifies listeners when it completes; a
+                # pre-notify here would just redraw entities with stale data
                 await self.async_request_refresh()
                 return True
         except Exception as err:
@@ -193,7 +519,7 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
             self.remove_tracking_number(tracking_number)
             
             # Remove entity if callback is available
-            if hasattr(self, "_async_remove_entity"):
+            if self._async_remove_entity is not None:
                 try:
                     self._async_remove_entity(tracking_number)
                     _LOGGER.info("Removed entity for tracking number %s", tracking_number)
@@ -202,7 +528,7 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
             
             self._last_message = f"Removed tracking: {tracking_number}"
             self._last_error = None
-            self.async_update_listeners()  # Update logging sensor
+            await self.async_schedule_update_listeners()  # Update logging sensor
             
             # Don't refresh after removal - the entity is gone
             return True
@@ -219,10 +545,27 @@ class Ship24DataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Error updating package %s: %s", tracking_number, err)
 
     def _save_tracking_numbers(self) -> None:
-        """Save tracking numbers to config entry."""
+        """Schedule a debounced save of tracking numbers to the config entry.
+
+        Rapid add/remove bursts coalesce into a single entry write instead
+        of re-serializing and flushing .storage per mutation.
+        """
         if not self.entry:
             return
-        
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = self.hass.loop.call_later(
+            SAVE_DEBOUNCE_DELAY, self._do_save
+        )
+
+    def _do_save(self) -> None:
+        """Write the tracking numbers to the config entry if they changed."""
+        self._save_handle = None
+
+        saved = self.entry.data.get(CONF_TRACKING_NUMBERS, [])
+        if set(saved) == self._tracking_numbers:
+            return
+
         # Update config entry data
         new_data = {**self.entry.data, CONF_TRACKING_NUMBERS: list(self._tracking_numbers)}
         self.hass.config_entries.async_update_entry(self.entry, data=new_data)
@@ -33,10 +33,28 @@ from .const import (
     STATUS_OUT_FOR_DELIVERY,
     STATUS_PENDING,
 )
-from .coordinator import Ship24DataUpdateCoordinator
+from .coordinator import RETRYABLE_ERROR_RE, Ship24DataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# All Ship24 entities share one device; build the DeviceInfo once
+_DEVICE_INFO = DeviceInfo(
+    identifiers={DEVICE_IDENTIFIER},
+    name=DEVICE_NAME,
+    manufacturer="Ship24",
+    model="Package Tracking",
+)
+
+# Built once at import; the icon property is read on every state write
+_DEFAULT_ICON = "mdi:package-variant"
+_STATUS_ICON = {
+    STATUS_PENDING: "mdi:package-variant",
+    STATUS_IN_TRANSIT: "mdi:truck-delivery",
+    STATUS_OUT_FOR_DELIVERY: "mdi:truck-fast",
+    STATUS_DELIVERED: "mdi:check-circle",
+    STATUS_EXCEPTION: "mdi:alert-circle",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -44,13 +62,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Ship24 sensors from a config entry."""
-    coordinator: Ship24DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
+    coordinator: Ship24DataUpdateCoordinator = entry.runtime_data
 
     # Store the async_add_entities callback for dynamic entity creation
+    # (coordinator.hass is already set by DataUpdateCoordinator.__init__)
     coordinator._async_add_entities = async_add_entities
-    coordinator.hass = hass  # Store hass reference for entity removal
+
+    # Fetched once and captured by the closures below; the registry
+    # reference is stable for the lifetime of this entry
+    entity_registry = er.async_get(hass)
+    unique_id_prefix = f"{DOMAIN}_"
 
     @callback
     def async_add_sensor(tracking_number: str) -> None:
@@ -59,12 +80,11 @@ async def async_setup_entry(
         # This ensures sensors are recreated during reload even if they exist in registry
         sensor = Ship24PackageSensor(coordinator, tracking_number)
         async_add_entities([sensor])
-    
+
     @callback
     def async_remove_sensor(tracking_number: str) -> None:
         """Remove sensor for a tracking number."""
-        entity_registry = er.async_get(hass)
-        unique_id = f"{DOMAIN}_{tracking_number}"
+        unique_id = unique_id_prefix + tracking_number
         entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
         if entity_id:
             # Remove from entity registry (this will also remove from platform)
@@ -76,14 +96,10 @@ async def async_setup_entry(
     # Store remove callback
     coordinator._async_remove_entity = async_remove_sensor
 
-    # Create logging sensor (always created)
-    logging_sensor = Ship24LoggingSensor(coordinator)
-    async_add_entities([logging_sensor])
-
     # Get tracked numbers and create sensors for all of them
     # This ensures sensors are always created during setup/reload
     tracked_numbers = coordinator.get_tracking_numbers()
-    
+
     # Refresh data FIRST if we have tracking numbers (before creating sensors)
     # This ensures coordinator.data is available when sensors are created
     if tracked_numbers:
@@ -92,8 +108,7 @@ async def async_setup_entry(
         except Exception as err:
             # Don't fail setup if initial refresh fails (e.g., DNS not ready after reboot)
             # The coordinator will retry automatically
-            error_str = str(err).lower()
-            if any(keyword in error_str for keyword in ['timeout', 'dns', 'connection', 'network']):
+            if RETRYABLE_ERROR_RE.search(str(err)):
                 _LOGGER.warning(
                     "Initial refresh failed due to network issue (likely DNS not ready after reboot): %s. "
                     "Sensors will be created and will retry automatically.",
@@ -107,34 +122,45 @@ async def async_setup_entry(
     
     if tracked_numbers:
         _LOGGER.info("Creating sensors for %d tracked packages: %s", len(tracked_numbers), tracked_numbers)
-        # Create sensors for all tracked numbers
-        sensors_to_add = []
-        for tracking_number in tracked_numbers:
-            sensors_to_add.append(Ship24PackageSensor(coordinator, tracking_number))
-        async_add_entities(sensors_to_add)
     else:
         # No tracking numbers yet - entities will be created when tracking is added via service
         _LOGGER.info("No tracking numbers configured yet. Use ship24.add_tracking service to add packages.")
-    
+
+    # One add_entities call for the logging sensor plus all package sensors
+    # amortizes the platform setup cost across the whole batch
+    async_add_entities(
+        [
+            Ship24LoggingSensor(coordinator),
+            *(
+                Ship24PackageSensor(coordinator, tracking_number)
+                for tracking_number in tracked_numbers
+            ),
+        ]
+    )
+
     # Check for orphaned sensors (entities in registry but not in tracked list)
-    # This handles cleanup of manually removed tracking numbers
-    entity_registry = er.async_get(hass)
-    existing_entity_ids = []
-    for entity_entry in entity_registry.entities.values():
-        if entity_entry.platform == DOMAIN and entity_entry.domain == "sensor":
-            # Extract tracking number from unique_id (format: ship24_{tracking_number})
-            if entity_entry.unique_id.startswith(f"{DOMAIN}_"):
-                tracking_num = entity_entry.unique_id.replace(f"{DOMAIN}_", "", 1)
-                # Skip logging sensor
-                if tracking_num != "logging":
-                    existing_entity_ids.append(tracking_num)
-    
+    # This handles cleanup of manually removed tracking numbers.
+    # entries_for_config_entry is indexed by entry ID, so this is O(our
+    # entities) instead of a scan over every entity in the registry. The
+    # tracking-number -> entity_id map makes the removal pass pure dict
+    # lookups instead of composite-key registry queries per orphan
+    entity_id_map = {
+        entity_entry.unique_id.removeprefix(unique_id_prefix): entity_entry.entity_id
+        for entity_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        )
+        if entity_entry.domain == "sensor"
+        and entity_entry.unique_id.startswith(unique_id_prefix)
+        and entity_entry.unique_id != f"{DOMAIN}_logging"
+    }
+
     # Find orphaned sensors (entity exists but not in tracked list)
-    orphaned_sensors = set(existing_entity_ids) - tracked_numbers
+    orphaned_sensors = entity_id_map.keys() - tracked_numbers
     if orphaned_sensors:
         _LOGGER.info("Found %d orphaned sensors, removing them: %s", len(orphaned_sensors), orphaned_sensors)
         for tracking_number in orphaned_sensors:
-            async_remove_sensor(tracking_number)
+            entity_registry.async_remove(entity_id_map[tracking_number])
+            _LOGGER.info("Removed entity %s for tracking number %s", entity_id_map[tracking_number], tracking_number)
 
 
 class Ship24PackageSensor(CoordinatorEntity, SensorEntity):
@@ -151,16 +177,18 @@ class Ship24PackageSensor(CoordinatorEntity, SensorEntity):
         self._tracking_number = tracking_number
         self._attr_unique_id = f"{DOMAIN}_{tracking_number}"
         self._attr_name = tracking_number
+        # Cached (id(package), attrs) so repeated attribute reads between
+        # coordinator updates skip the dict rebuild
+        self._attrs_cache: tuple[int, dict[str, Any]] | None = None
+        # Last coordinator version/success seen, to skip state writes when
+        # a refresh left this package untouched
+        self._seen_version = -1
+        self._seen_success: bool | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information - all sensors share the same device."""
-        return DeviceInfo(
-            identifiers={DEVICE_IDENTIFIER},
-            name=DEVICE_NAME,
-            manufacturer="Ship24",
-            model="Package Tracking",
-        )
+        return _DEVICE_INFO
 
     @property
     def available(self) -> bool:
@@ -186,20 +214,11 @@ class Ship24PackageSensor(CoordinatorEntity, SensorEntity):
     def icon(self) -> str:
         """Return the icon for the sensor."""
         if self.coordinator.data is None:
-            return "mdi:package-variant"
+            return _DEFAULT_ICON
         package = self.coordinator.data.get(self._tracking_number)
         if not package:
-            return "mdi:package-variant"
-
-        status = package.status
-        icon_map = {
-            STATUS_PENDING: "mdi:package-variant",
-            STATUS_IN_TRANSIT: "mdi:truck-delivery",
-            STATUS_OUT_FOR_DELIVERY: "mdi:truck-fast",
-            STATUS_DELIVERED: "mdi:check-circle",
-            STATUS_EXCEPTION: "mdi:alert-circle",
-        }
-        return icon_map.get(status, "mdi:package-variant")
+            return _DEFAULT_ICON
+        return _STATUS_ICON.get(package.status, _DEFAULT_ICON)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -210,40 +229,60 @@ class Ship24PackageSensor(CoordinatorEntity, SensorEntity):
         if not package:
             return {}
 
-        attrs = package.to_dict()
-        # Ensure location is properly formatted
-        if attrs.get("latitude") and attrs.get("longitude"):
-            attrs[ATTR_LOCATION] = {
-                "latitude": attrs["latitude"],
-                "longitude": attrs["longitude"],
+        cached = self._attrs_cache
+        if cached is not None and cached[0] == id(package):
+            return cached[1]
+
+        # Read fields straight off the dataclass instead of serializing the
+        # whole package with to_dict() and discarding most of the copy
+        lat = package.latitude
+        lng = package.longitude
+        location = {"latitude": lat, "longitude": lng} if lat and lng else None
+        last_update = package.last_update
+        estimated = package.estimated_delivery
+        events = [
+            {
+                "timestamp": event.timestamp_iso,
+                "location": event.location,
+                "status": event.status,
+                "status_text": event.status_text,
+                "description": event.description,
+                "latitude": event.latitude,
+                "longitude": event.longitude,
             }
-        else:
-            attrs[ATTR_LOCATION] = None
-
-        # Remove internal fields
-        attrs.pop("latitude", None)
-        attrs.pop("longitude", None)
-
-        return {
-            ATTR_TRACKING_NUMBER: attrs.get(ATTR_TRACKING_NUMBER),
-            ATTR_CARRIER: attrs.get(ATTR_CARRIER),
-            ATTR_STATUS: attrs.get(ATTR_STATUS),
-            ATTR_STATUS_TEXT: attrs.get(ATTR_STATUS_TEXT),
-            ATTR_LAST_UPDATE: attrs.get(ATTR_LAST_UPDATE),
-            ATTR_ESTIMATED_DELIVERY: attrs.get(ATTR_ESTIMATED_DELIVERY),
-            ATTR_LOCATION: attrs.get(ATTR_LOCATION),
-            ATTR_LOCATION_TEXT: attrs.get(ATTR_LOCATION_TEXT),
-            ATTR_EVENTS: attrs.get(ATTR_EVENTS),
-            ATTR_EVENT_COUNT: attrs.get(ATTR_EVENT_COUNT),
-            ATTR_CUSTOM_NAME: attrs.get(ATTR_CUSTOM_NAME),
-            ATTR_TRACKER_ID: attrs.get(ATTR_TRACKER_ID),
+            for event in package.events
+        ]
+
+        result = {
+            ATTR_TRACKING_NUMBER: package.tracking_number,
+            ATTR_CARRIER: package.carrier,
+            ATTR_STATUS: package.status,
+            ATTR_STATUS_TEXT: package.status_text,
+            ATTR_LAST_UPDATE: last_update.isoformat() if last_update else None,
+            ATTR_ESTIMATED_DELIVERY: estimated.isoformat() if estimated else None,
+            ATTR_LOCATION: location,
+            ATTR_LOCATION_TEXT: package.location,
+            ATTR_EVENTS: events,
+            ATTR_EVENT_COUNT: len(events),
+            ATTR_CUSTOM_NAME: package.custom_name,
+            ATTR_TRACKER_ID: package.tracker_id,
         }
+        self._attrs_cache = (id(package), result)
+        return result
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        # Ensure name is always set to tracking number
-        self._attr_name = self._tracking_number
+        # Skip the state write entirely when neither this package nor the
+        # coordinator's success flag changed since the last dispatch
+        version = self.coordinator.data_version(self._tracking_number)
+        success = self.coordinator.last_update_success
+        if version == self._seen_version and success == self._seen_success:
+            return
+        self._seen_version = version
+        self._seen_success = success
+        # _attr_name is set once in __init__ and never changes
+        self._attrs_cache = None
         self.async_write_ha_state()
     
     async def async_added_to_hass(self) -> None:
@@ -270,12 +309,7 @@ class Ship24LoggingSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
-        return DeviceInfo(
-            identifiers={DEVICE_IDENTIFIER},
-            name=DEVICE_NAME,
-            manufacturer="Ship24",
-            model="Package Tracking",
-        )
+        return _DEVICE_INFO
 
     @property
     def native_value(self) -> str:
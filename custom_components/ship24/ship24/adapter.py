@@ -1,9 +1,18 @@
 """Ship24 response adapter - Converts Ship24 API responses to PackageData models."""
 
 import logging
-from datetime import datetime
+import operator
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+# ciso8601 parses ISO timestamps in C, several times faster than
+# datetime.fromisoformat; fall back silently when it is not installed
+try:
+    from ciso8601 import parse_datetime as _fast_iso
+except ImportError:
+    _fast_iso = None
+
 from ..app.models import PackageData, TrackingEvent
 from ..const import (
     STATUS_DELIVERED,
@@ -19,161 +28,211 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Retaining raw Ship24 payloads multiplies coordinator memory by the full
+# response size per package; flip on only when debugging adapter parsing
+_KEEP_RAW_DATA = False
 
-class Ship24Adapter:
-    """Adapter for converting Ship24 API responses to PackageData models."""
+# Statistics timestamps checked for last_update, most significant first
+_TIMESTAMP_KEYS = (
+    "deliveredDatetime",
+    "outForDeliveryDatetime",
+    "inTransitDatetime",
+    "infoReceivedDatetime",
+)
 
-    @staticmethod
-    def _parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
-        """Parse datetime string from Ship24 format.
-        
-        Handles multiple datetime formats:
-        - ISO format with Z (UTC): "2021-04-27T15:09:00.000Z"
-        - ISO format with timezone offset: "2021-04-27T15:09:00+02:00"
-        - ISO format without timezone (assumed UTC): "2021-04-27T15:09:00"
-        - Alternative formats: "2021-04-27 15:09:00", "2021-04-27"
-        """
-        if not date_str:
-            return None
-        
-        from datetime import timezone
-        
-        try:
-            # Handle ISO format with Z (UTC) - convert to +00:00 format
-            if date_str.endswith("Z"):
-                return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            
-            # Try parsing as ISO format (with or without timezone)
-            dt = datetime.fromisoformat(date_str)
-            # If naive datetime (no timezone), assume UTC
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-            
-        except (ValueError, AttributeError):
+# Fallback formats for non-ISO datetimes Ship24 occasionally emits
+_DATETIME_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+@lru_cache(maxsize=2048)
+def _parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
+    """Parse datetime string from Ship24 format.
+
+    Handles multiple datetime formats:
+    - ISO format with Z (UTC): "2021-04-27T15:09:00.000Z"
+    - ISO format with timezone offset: "2021-04-27T15:09:00+02:00"
+    - ISO format without timezone (assumed UTC): "2021-04-27T15:09:00"
+    - Alternative formats: "2021-04-27 15:09:00", "2021-04-27"
+
+    Results are memoized: identical timestamps repeat across events and
+    refreshes, so repeated parses become a dict hit.
+    """
+    if not date_str:
+        return None
+
+    # Handle ISO format with Z (UTC) - single slice, no scan-and-replace
+    if date_str.endswith("Z"):
+        date_str = date_str[:-1] + "+00:00"
+
+    try:
+        dt = _fast_iso(date_str) if _fast_iso is not None else datetime.fromisoformat(date_str)
+        # If naive datetime (no timezone), assume UTC
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except (ValueError, AttributeError):
+        # Try alternative formats
+        for fmt in _DATETIME_FORMATS:
             try:
-                # Try alternative formats
-                for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
-                    try:
-                        dt = datetime.strptime(date_str, fmt)
-                        # Assume UTC for naive datetimes
-                        dt = dt.replace(tzinfo=timezone.utc)
-                        return dt
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
-            _LOGGER.warning("Failed to parse datetime: %s", date_str)
-            return None
-
-    @staticmethod
-    def _map_status_milestone(status_milestone: Optional[str], status_code: Optional[str] = None) -> tuple[str, str]:
-        """Map Ship24 statusMilestone to standardized status.
+                # Assume UTC for naive datetimes
+                return datetime.strptime(date_str, fmt).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+        _LOGGER.warning("Failed to parse datetime: %s", date_str)
+        return None
+
+
+# Ship24 statusMilestone -> (status, status_text), built once; the mapper
+# runs once per event so a per-call dict literal is the adapter's hottest
+# allocation
+_STATUS_MILESTONE_MAP = {
+    "info_received": (STATUS_PENDING, "Info Received"),
+    "in_transit": (STATUS_IN_TRANSIT, "In Transit"),
+    "out_for_delivery": (STATUS_OUT_FOR_DELIVERY, "Out for Delivery"),
+    "delivered": (STATUS_DELIVERED, "Delivered"),
+    "exception": (STATUS_EXCEPTION, "Exception"),
+    "failed_attempt": (STATUS_EXCEPTION, "Failed Attempt"),
+    "available_for_pickup": (STATUS_IN_TRANSIT, "Available for Pickup"),
+}
+
+# statusCode substrings that override the milestone mapping, scanned in
+# order; a small constant tuple beats an if/elif chain per event
+_STATUS_CODE_OVERRIDES = (
+    ("delivery_delivered", (STATUS_DELIVERED, "Delivered")),
+    ("delivery_out_for_delivery", (STATUS_OUT_FOR_DELIVERY, "Out for Delivery")),
+    ("exception", (STATUS_EXCEPTION, "Exception")),
+    ("failed", (STATUS_EXCEPTION, "Exception")),
+)
 
-        Args:
-            status_milestone: The statusMilestone from Ship24
-            status_code: Optional statusCode for additional context
 
-        Returns:
-            Tuple of (status_code, status_text)
-        """
-        if not status_milestone:
-            return STATUS_UNKNOWN, "Unknown"
-
-        milestone_lower = status_milestone.lower()
-
-        # Map Ship24 statusMilestone values
-        status_map = {
-            "info_received": (STATUS_PENDING, "Info Received"),
-            "in_transit": (STATUS_IN_TRANSIT, "In Transit"),
-            "out_for_delivery": (STATUS_OUT_FOR_DELIVERY, "Out for Delivery"),
-            "delivered": (STATUS_DELIVERED, "Delivered"),
-            "exception": (STATUS_EXCEPTION, "Exception"),
-            "failed_attempt": (STATUS_EXCEPTION, "Failed Attempt"),
-            "available_for_pickup": (STATUS_IN_TRANSIT, "Available for Pickup"),
-        }
-
-        status_code_result, status_text = status_map.get(milestone_lower, (STATUS_UNKNOWN, status_milestone))
-
-        # Override with statusCode if it provides more specific info
-        if status_code:
-            status_code_lower = status_code.lower()
-            if "delivery_delivered" in status_code_lower:
-                return STATUS_DELIVERED, "Delivered"
-            elif "delivery_out_for_delivery" in status_code_lower:
-                return STATUS_OUT_FOR_DELIVERY, "Out for Delivery"
-            elif "exception" in status_code_lower or "failed" in status_code_lower:
-                return STATUS_EXCEPTION, "Exception"
-
-        return status_code_result, status_text
+def _map_status_milestone(status_milestone: Optional[str], status_code: Optional[str] = None) -> tuple[str, str]:
+    """Map Ship24 statusMilestone to standardized status.
+
+    Args:
+        status_milestone: The statusMilestone from Ship24
+        status_code: Optional statusCode for additional context
+
+    Returns:
+        Tuple of (status_code, status_text)
+    """
+    if not status_milestone:
+        return STATUS_UNKNOWN, "Unknown"
+
+    milestone_lower = status_milestone.lower()
+
+    status_code_result, status_text = _STATUS_MILESTONE_MAP.get(
+        milestone_lower, (STATUS_UNKNOWN, status_milestone)
+    )
+
+    # Override with statusCode if it provides more specific info
+    if status_code:
+        status_code_lower = status_code.lower()
+        for substring, override in _STATUS_CODE_OVERRIDES:
+            if substring in status_code_lower:
+                return override
+
+    return status_code_result, status_text
+
+
+def _extract_location(event: Dict[str, Any]) -> tuple[Optional[float], Optional[float], Optional[str]]:
+    """Extract location data from event.
+
+    Returns:
+        Tuple of (latitude, longitude, location_text)
+    """
+    location = event.get("location") or {}
+    if isinstance(location, dict):
+        # Probe the dominant key first and fall back on None only; an
+        # `or` chain would both re-call .get and treat lat/lng 0.0 as
+        # missing
+        lat = location.get("latitude")
+        if lat is None:
+            lat = location.get("lat")
+        lng = location.get("longitude")
+        if lng is None:
+            lng = location.get("lng")
+        if lng is None:
+            lng = location.get("lon")
+        location_text = location.get("address") or location.get("name") or location.get("city")
+        try:
+            lat_float = float(lat) if lat is not None else None
+            lng_float = float(lng) if lng is not None else None
+            return lat_float, lng_float, location_text
+        except (ValueError, TypeError):
+            pass
+    elif isinstance(location, str):
+        return None, None, location
+
+    return None, None, None
+
+
+def _parse_events(events_data: List[Dict[str, Any]]) -> List[TrackingEvent]:
+    """Parse tracking events from Ship24 response."""
+    events = []
+    for event_data in events_data or []:
+        # Ship24 uses occurrenceDatetime
+        timestamp = _parse_datetime(
+            event_data.get("occurrenceDatetime")
+            or event_data.get("occurredAt")
+            or event_data.get("datetime")
+            or event_data.get("timestamp")
+        )
+        if not timestamp:
+            continue
 
-    @staticmethod
-    def _extract_location(event: Dict[str, Any]) -> tuple[Optional[float], Optional[float], Optional[str]]:
-        """Extract location data from event.
+        # Use statusMilestone for status mapping
+        status_milestone = event_data.get("statusMilestone")
+        status_code = event_data.get("statusCode")
+        status_code_result, status_text = _map_status_milestone(
+            status_milestone, status_code
+        )
 
-        Returns:
-            Tuple of (latitude, longitude, location_text)
-        """
-        location = event.get("location") or {}
-        if isinstance(location, dict):
-            lat = location.get("latitude") or location.get("lat")
-            lng = location.get("longitude") or location.get("lng") or location.get("lon")
-            location_text = location.get("address") or location.get("name") or location.get("city")
-            try:
-                lat_float = float(lat) if lat is not None else None
-                lng_float = float(lng) if lng is not None else None
-                return lat_float, lng_float, location_text
-            except (ValueError, TypeError):
-                pass
-        elif isinstance(location, str):
-            return None, None, location
+        # Location is a string in Ship24 events
+        location_text = event_data.get("location")
+        lat, lng = None, None  # Ship24 events don't have lat/lng in location field
 
-        return None, None, None
+        # Status text from event
+        event_status_text = event_data.get("status") or status_text
 
-    @staticmethod
-    def _parse_events(events_data: List[Dict[str, Any]]) -> List[TrackingEvent]:
-        """Parse tracking events from Ship24 response."""
-        events = []
-        for event_data in events_data or []:
-            # Ship24 uses occurrenceDatetime
-            timestamp = Ship24Adapter._parse_datetime(
-                event_data.get("occurrenceDatetime")
-                or event_data.get("occurredAt")
-                or event_data.get("datetime")
-                or event_data.get("timestamp")
-            )
-            if not timestamp:
-                continue
+        event = TrackingEvent(
+            timestamp=timestamp,
+            location=location_text,
+            status=status_code_result,
+            status_text=event_status_text,
+            description=event_status_text,
+            latitude=lat,
+            longitude=lng,
+            raw_data=event_data if _KEEP_RAW_DATA else {},
+        )
+        events.append(event)
+
+    # Sort by timestamp (oldest first). Ship24 usually sends events
+    # already ordered, so detect the direction in one O(N) scan and
+    # only fall back to the full sort for genuinely shuffled input
+    if all(
+        events[i].timestamp <= events[i + 1].timestamp
+        for i in range(len(events) - 1)
+    ):
+        return events
+    if all(
+        events[i].timestamp >= events[i + 1].timestamp
+        for i in range(len(events) - 1)
+    ):
+        events.reverse()
+        return events
+    events.sort(key=operator.attrgetter("timestamp"))
+    return events
 
-            # Use statusMilestone for status mapping
-            status_milestone = event_data.get("statusMilestone")
-            status_code = event_data.get("statusCode")
-            status_code_result, status_text = Ship24Adapter._map_status_milestone(
-                status_milestone, status_code
-            )
 
-            # Location is a string in Ship24 events
-            location_text = event_data.get("location")
-            lat, lng = None, None  # Ship24 events don't have lat/lng in location field
-
-            # Status text from event
-            event_status_text = event_data.get("status") or status_text
-
-            event = TrackingEvent(
-                timestamp=timestamp,
-                location=location_text,
-                status=status_code_result,
-                status_text=event_status_text,
-                description=event_status_text,
-                latitude=lat,
-                longitude=lng,
-                raw_data=event_data,
-            )
-            events.append(event)
+class Ship24Adapter:
+    """Adapter for converting Ship24 API responses to PackageData models."""
 
-        # Sort by timestamp (oldest first)
-        events.sort(key=lambda e: e.timestamp)
-        return events
+    # Hot helpers live at module scope (no descriptor hop per call); the
+    # class keeps aliases for API continuity
+    _parse_datetime = staticmethod(_parse_datetime)
+    _map_status_milestone = staticmethod(_map_status_milestone)
+    _extract_location = staticmethod(_extract_location)
+    _parse_events = staticmethod(_parse_events)
 
     @staticmethod
     def to_package_data(tracker_data: Dict[str, Any]) -> PackageData:
@@ -207,7 +266,7 @@ class Ship24Adapter:
         # Get status from shipment.statusMilestone
         status_milestone = shipment.get("statusMilestone")
         status_code = shipment.get("statusCode")
-        status_code_result, status_text = Ship24Adapter._map_status_milestone(
+        status_code_result, status_text = _map_status_milestone(
             status_milestone, status_code
         )
 
@@ -226,7 +285,7 @@ class Ship24Adapter:
             carrier_code = courier_codes
 
         # Parse events
-        events = Ship24Adapter._parse_events(events_data if isinstance(events_data, list) else [])
+        events = _parse_events(events_data if isinstance(events_data, list) else [])
 
         # Get latest event for location
         latest_event = events[-1] if events else None
@@ -238,16 +297,19 @@ class Ship24Adapter:
         statistics = tracking.get("statistics", {})
         timestamps = statistics.get("timestamps", {}) if statistics else {}
         
-        last_update = latest_event.timestamp if latest_event else Ship24Adapter._parse_datetime(
-            timestamps.get("deliveredDatetime")
-            or timestamps.get("outForDeliveryDatetime")
-            or timestamps.get("inTransitDatetime")
-            or timestamps.get("infoReceivedDatetime")
-        )
+        if latest_event:
+            last_update = latest_event.timestamp
+        else:
+            last_update = _parse_datetime(
+                next(
+                    (timestamps[key] for key in _TIMESTAMP_KEYS if timestamps.get(key)),
+                    None,
+                )
+            )
         
         # Estimated delivery from shipment.delivery
         delivery = shipment.get("delivery", {})
-        estimated_delivery = Ship24Adapter._parse_datetime(
+        estimated_delivery = _parse_datetime(
             delivery.get("estimatedDeliveryDate")
         )
 
@@ -267,13 +329,16 @@ class Ship24Adapter:
             longitude=longitude,
             events=events,
             tracker_id=tracker_id,
-            raw_data=tracker_data,
+            raw_data=tracker_data if _KEEP_RAW_DATA else {},
         )
 
     @staticmethod
-    async def process_webhook(webhook_payload: Dict[str, Any]) -> Optional[PackageData]:
+    def process_webhook(webhook_payload: Dict[str, Any]) -> Optional[PackageData]:
         """Process webhook payload from Ship24.
 
+        Pure parsing, no I/O - deliberately not a coroutine so each webhook
+        skips a frame allocation.
+
         Args:
             webhook_payload: Raw webhook payload (has trackings array)
 
@@ -316,20 +381,64 @@ class Ship24Backend:
         response = await self._client.create_tracker(tracking_number)
         return self._adapter.to_package_data(response)
 
-    async def get_tracker(self, tracking_number: str) -> Optional[PackageData]:
-        """Get tracker and return PackageData."""
+    async def get_tracker(
+        self, tracking_number: str, if_newer_than: Optional[datetime] = None
+    ) -> Optional[PackageData]:
+        """Get tracker and return PackageData.
+
+        Args:
+            tracking_number: The tracking number to fetch
+            if_newer_than: Cached last-update hint; when the fetched data is
+                not newer, return None so the caller keeps its cached package
+
+        Returns:
+            PackageData, or None on failure / when unchanged
+        """
         try:
             response = await self._client.get_tracker(tracking_number)
-            return self._adapter.to_package_data(response)
+            package_data = self._adapter.to_package_data(response)
         except Exception as err:
             _LOGGER.error("Failed to get tracker %s: %s", tracking_number, err)
             return None
 
+        # Ship24's public API has no conditional requests, so the freshness
+        # check happens post-parse: unchanged data keeps the cached object
+        # (and its serialized dict cache) alive
+        if (
+            if_newer_than is not None
+            and package_data.last_update is not None
+            and package_data.last_update <= if_newer_than
+        ):
+            return None
+
+        return package_data
+
+    async def get_trackers(self, tracking_numbers: List[str]) -> List[PackageData]:
+        """Get multiple trackers with a single bulk request.
+
+        Args:
+            tracking_numbers: The tracking numbers to fetch
+
+        Returns:
+            List of PackageData for the trackers Ship24 returned
+        """
+        response = await self._client.search_trackers(tracking_numbers)
+        trackings = (response.get("data") or {}).get("trackings", [])
+        packages = []
+        for tracking in trackings:
+            try:
+                packages.append(
+                    self._adapter.to_package_data({"data": {"trackings": [tracking]}})
+                )
+            except Exception as err:
+                _LOGGER.error("Failed to parse tracker from bulk response: %s", err)
+        return packages
+
     async def delete_tracker(self, tracking_number: str) -> bool:
         """Delete tracker."""
         return await self._client.delete_tracker(tracking_number)
 
     async def process_webhook(self, payload: dict) -> Optional[PackageData]:
         """Process webhook payload."""
-        return await Ship24Adapter.process_webhook(payload)
+        return Ship24Adapter.process_webhook(payload)
 
@@ -2,9 +2,14 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import random
+from collections import OrderedDict, deque
+from operator import itemgetter
+from time import monotonic, perf_counter
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
+import orjson
 
 from ..const import (
     SHIP24_API_BASE_URL,
@@ -18,7 +23,27 @@ _LOGGER = logging.getLogger(__name__)
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY_BASE = 2  # Base delay in seconds for exponential backoff
+MAX_BACKOFF = 30  # Cap on the backoff delay in seconds
 REQUEST_TIMEOUT = 30  # Request timeout in seconds
+TRACKERS_CACHE_TTL = 10.0  # How long a fetched trackers list stays fresh (seconds)
+RESULTS_CACHE_MAX = 256  # Bound on cached tracker results
+RESULTS_CACHE_TTL = 30.0  # Results freshness for in-flight packages (seconds)
+RESULTS_CACHE_TTL_DELIVERED = 3600.0  # Delivered packages never change; cache longer
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+OVERALL_REQUEST_BUDGET = 45  # Hard cap on one request incl. retries (seconds)
+
+# C-level field extraction for the active-tracker filter
+_ACTIVE_FIELDS = itemgetter("isSubscribed", "isTracked")
+_ACTIVE = (True, True)
+
+
+class _TransientHTTPError(aiohttp.ClientError):
+    """Retryable HTTP status (429/5xx), carrying any Retry-After hint."""
+
+    def __init__(self, status: int, retry_after: float) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
 
 
 class Ship24Client:
@@ -33,17 +58,91 @@ class Ship24Client:
         """
         self._api_key = api_key
         self._session = session
+        self._owns_session = session is None
         self._headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
         }
         self._base_url = SHIP24_API_BASE_URL
+        # Endpoint URLs built once; _request takes full URLs so the hot
+        # path does no string concatenation
+        self._trackers_url = SHIP24_API_BASE_URL + SHIP24_API_TRACKERS_ENDPOINT
+        self._track_url = SHIP24_API_BASE_URL + SHIP24_API_TRACKERS_TRACK_ENDPOINT
+        self._search_url = SHIP24_API_BASE_URL + SHIP24_API_TRACKERS_SEARCH_ENDPOINT
+        self._results_url_cache: Dict[str, str] = {}
+        # Last ETag and decoded body per GET URL; If-None-Match turns
+        # unchanged polls into tiny 304 responses
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        # Set by aclose(); wakes any backoff sleep so shutdown isn't stuck
+        # behind a pending retry
+        self._shutdown_event = asyncio.Event()
+        # Ring buffer of (url, elapsed_seconds, status) samples for
+        # get_timing_stats; bounded so it can't grow unboundedly
+        self._stats: deque = deque(maxlen=1024)
         # Create timeout configuration
         self._timeout = aiohttp.ClientTimeout(
             total=REQUEST_TIMEOUT,
             connect=10,  # Connection timeout (including DNS)
             sock_read=20  # Socket read timeout
         )
+        # Short-lived trackers-list cache: bursts of find_tracker calls
+        # (e.g. importing N packages at setup) share one HTTP round-trip
+        self._trackers_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._trackers_cache_ttl = TRACKERS_CACHE_TTL
+        # Dict index over the cached list so find_tracker is O(1) instead of
+        # a linear scan per lookup
+        self._trackers_by_number: Dict[str, Dict[str, Any]] = {}
+        # In-flight list fetch shared by concurrent callers (single-flight)
+        self._inflight_list: Optional[asyncio.Future] = None
+        # Bounded LRU of tracker results keyed by tracking number, storing
+        # (expiry, response). Delivered packages get a long TTL since their
+        # history is final
+        self._results_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the persistent session, creating it lazily if needed.
+
+        A single long-lived session reuses keep-alive connections and the
+        DNS cache instead of paying TCP+TLS setup on every request.
+        """
+        if self._session is None or self._session.closed:
+            # Tuned connector: cached DNS and a bounded keep-alive pool.
+            # Only built for owned sessions; HA's shared session brings its
+            # own connector
+            connector = aiohttp.TCPConnector(
+                limit=10,
+                limit_per_host=5,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=self._timeout,
+                connector=connector,
+                # Default headers are applied once at session level, so
+                # per-call requests skip the dict merge entirely
+                headers=self._headers,
+            )
+            self._owns_session = True
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the session if this client owns it."""
+        self._shutdown_event.set()
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "Ship24Client":
+        """Enter async context."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Exit async context, closing an owned session."""
+        await self.aclose()
 
     def _is_retryable_error(self, err: Exception) -> bool:
         """Check if an error is retryable (transient network error).
@@ -54,6 +153,9 @@ class Ship24Client:
         Returns:
             True if the error is retryable, False otherwise
         """
+        # Transient HTTP statuses (429/5xx) are retryable
+        if isinstance(err, _TransientHTTPError):
+            return True
         # DNS/timeout errors are retryable
         if isinstance(err, (aiohttp.ClientConnectorError, aiohttp.ServerTimeoutError, asyncio.TimeoutError)):
             return True
@@ -64,10 +166,18 @@ class Ship24Client:
                 return True
         return False
 
+    def _results_url(self, tracking_number: str) -> str:
+        """Return the (cached) results URL for a tracking number."""
+        url = self._results_url_cache.get(tracking_number)
+        if url is None:
+            url = f"{self._search_url}/{tracking_number}/results"
+            self._results_url_cache[tracking_number] = url
+        return url
+
     async def _request(
         self,
         method: str,
-        endpoint: str,
+        url: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
@@ -75,7 +185,7 @@ class Ship24Client:
 
         Args:
             method: HTTP method (GET, POST, DELETE, etc.)
-            endpoint: API endpoint path
+            url: Full API URL
             data: Request body data
             params: Query parameters
 
@@ -85,58 +195,135 @@ class Ship24Client:
         Raises:
             aiohttp.ClientError: On HTTP errors after retries exhausted
         """
-        url = f"{self._base_url}{endpoint}"
-        # Use provided session or create a temporary one
-        use_temporary_session = self._session is None
-        session = self._session or aiohttp.ClientSession()
-
+        session = self._get_session()
+
+        # Owned sessions already carry the default headers; HA's shared
+        # session is used by other integrations, so auth must stay per-call
+        headers = None if self._owns_session else self._headers
+        etag_entry = self._etag_cache.get(url) if method == "GET" else None
+        if etag_entry is not None:
+            headers = {**self._headers, "If-None-Match": etag_entry[0]}
+
+        last_error = None
+        t0 = perf_counter()
+        # Hard ceiling over the whole retry loop: without it, retries plus
+        # backoff sleeps can stall the coordinator for well over a minute
         try:
-            last_error = None
-            for attempt in range(MAX_RETRIES):
-                try:
-                    async with session.request(
-                        method,
-                        url,
-                        headers=self._headers,
-                        json=data,
-                        params=params,
-                        timeout=self._timeout,
-                    ) as response:
-                        response.raise_for_status()
-                        result = await response.json()
-                        # Success - return immediately
-                        return result
-                except aiohttp.ClientError as err:
-                    last_error = err
-                    if self._is_retryable_error(err) and attempt < MAX_RETRIES - 1:
-                        # Calculate exponential backoff delay
-                        delay = RETRY_DELAY_BASE * (2 ** attempt)
-                        _LOGGER.warning(
-                            "Ship24 API request failed (attempt %d/%d): %s. Retrying in %d seconds...",
-                            attempt + 1,
-                            MAX_RETRIES,
-                            err,
-                            delay,
-                        )
-                        await asyncio.sleep(delay)
-                        continue
-                    else:
-                        # Non-retryable error or max retries reached
-                        _LOGGER.error("Ship24 API request failed: %s", err)
+            async with asyncio.timeout(OVERALL_REQUEST_BUDGET) as budget:
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        async with session.request(
+                            method,
+                            url,
+                            headers=headers,
+                            # Pre-encoded bytes; Content-Type is already set in
+                            # the headers, so aiohttp won't re-encode
+                            data=orjson.dumps(data) if data is not None else None,
+                            params=params,
+                            timeout=self._timeout,
+                        ) as response:
+                            if response.status == 304 and etag_entry is not None:
+                                # Not modified: reuse the previously decoded body
+                                self._stats.append((url, perf_counter() - t0, 304))
+                                return etag_entry[1]
+                            if response.status in RETRYABLE_STATUS:
+                                try:
+                                    retry_after = float(response.headers.get("Retry-After", 0))
+                                except ValueError:
+                                    retry_after = 0.0
+                                raise _TransientHTTPError(response.status, retry_after)
+                            # Non-retryable 4xx still raise normally
+                            response.raise_for_status()
+                            # Parse straight from bytes: skips .json()'s
+                            # content-type and charset probing
+                            raw = await response.read()
+                            # HEAD responses (and some 204s) carry no body
+                            result = orjson.loads(raw) if raw else {}
+                            if method == "GET":
+                                etag = response.headers.get("ETag")
+                                if etag:
+                                    self._etag_cache[url] = (etag, result)
+                            self._stats.append(
+                                (url, perf_counter() - t0, response.status)
+                            )
+                            # Success - return immediately
+                            return result
+                    except aiohttp.ClientError as err:
+                        last_error = err
+                        if self._is_retryable_error(err) and attempt < MAX_RETRIES - 1:
+                            # Full-jitter exponential backoff: decorrelates retries
+                            # across clients so a recovering API isn't hit by a
+                            # synchronized herd
+                            capped = min(MAX_BACKOFF, RETRY_DELAY_BASE * (2 ** attempt))
+                            delay = random.uniform(0, capped)
+                            if isinstance(err, _TransientHTTPError):
+                                # Honor the server's Retry-After if it asks for more
+                                delay = max(err.retry_after, delay)
+                            _LOGGER.warning(
+                                "Ship24 API request failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
+                                attempt + 1,
+                                MAX_RETRIES,
+                                err,
+                                delay,
+                            )
+                            try:
+                                # Interruptible backoff: returns early if
+                                # aclose() fires during the wait
+                                await asyncio.wait_for(
+                                    self._shutdown_event.wait(), timeout=delay
+                                )
+                            except TimeoutError:
+                                continue  # Backoff elapsed; retry
+                            # Shutdown requested mid-backoff; stop retrying
+                            raise
+                        else:
+                            # Non-retryable error or max retries reached
+                            _LOGGER.error("Ship24 API request failed: %s", err)
+                            raise
+                    except Exception as err:
+                        # Non-retryable errors (non-network errors)
+                        last_error = err
+                        _LOGGER.error("Ship24 API request failed with non-retryable error: %s", err)
                         raise
-                except Exception as err:
-                    # Non-retryable errors (non-network errors)
-                    last_error = err
-                    _LOGGER.error("Ship24 API request failed with non-retryable error: %s", err)
-                    raise
-        finally:
-            # Only close session if we created it (not if it was provided)
-            if use_temporary_session:
-                await session.close()
-        
-        # Should never reach here, but just in case
-        if last_error:
-            raise last_error
+
+                # Should never reach here, but just in case
+                if last_error:
+                    raise last_error
+        except TimeoutError:
+            # Per-attempt ClientTimeout raises the same TimeoutError type on
+            # Python 3.11+; only blame the budget when this context expired
+            if budget.expired():
+                _LOGGER.error(
+                    "Ship24 API request to %s exceeded the %ds retry budget",
+                    url,
+                    OVERALL_REQUEST_BUDGET,
+                )
+            raise
+
+    def get_timing_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-URL latency aggregates from recent requests.
+
+        Returns:
+            Mapping of URL to {"count", "p50", "p95"} in seconds
+        """
+        by_url: Dict[str, List[float]] = {}
+        for url, elapsed, _status in self._stats:
+            by_url.setdefault(url, []).append(elapsed)
+        stats = {}
+        for url, samples in by_url.items():
+            samples.sort()
+            count = len(samples)
+            stats[url] = {
+                "count": float(count),
+                "p50": samples[count // 2],
+                "p95": samples[min(count - 1, int(count * 0.95))],
+            }
+        return stats
+
+    def invalidate_trackers_cache(self) -> None:
+        """Drop the cached trackers list after a mutating call."""
+        self._trackers_cache = None
+        self._trackers_by_number = {}
 
     async def get_trackers_list(self) -> List[Dict[str, Any]]:
         """Get list of all trackers.
@@ -144,18 +331,45 @@ class Ship24Client:
         Returns:
             List of tracker objects (only isSubscribed=true and isTracked=true)
         """
+        cached = self._trackers_cache
+        if cached is not None and monotonic() - cached[0] < self._trackers_cache_ttl:
+            return cached[1]
+        # Coalesce concurrent callers onto one in-flight request so N
+        # simultaneous lookups at startup cost a single network call
+        if self._inflight_list is not None:
+            return await asyncio.shield(self._inflight_list)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight_list = future
         try:
-            response = await self._request("GET", SHIP24_API_TRACKERS_ENDPOINT)
+            response = await self._request("GET", self._trackers_url)
             trackers = response.get("data", {}).get("trackers", [])
-            # Filter only active trackers
-            return [
-                t
-                for t in trackers
-                if t.get("isSubscribed") is True and t.get("isTracked") is True
-            ]
+            # Filter only active trackers; itemgetter pulls both flags in one
+            # C call per tracker. Fall back to .get() if a tracker is ever
+            # missing a flag, since itemgetter raises KeyError
+            try:
+                active = [t for t in trackers if _ACTIVE_FIELDS(t) == _ACTIVE]
+            except KeyError:
+                active = [
+                    t
+                    for t in trackers
+                    if t.get("isSubscribed") is True and t.get("isTracked") is True
+                ]
+            self._trackers_cache = (monotonic(), active)
+            self._trackers_by_number = {
+                t["trackingNumber"]: t for t in active if "trackingNumber" in t
+            }
+            future.set_result(active)
+            return active
         except Exception as err:
             _LOGGER.error("Failed to get trackers list: %s", err)
+            future.set_result([])
             return []
+        finally:
+            self._inflight_list = None
+            if not future.done():
+                # Cancelled while awaiting _request: wake any shielded
+                # waiters instead of leaving them parked forever
+                future.cancel()
 
     async def find_tracker(self, tracking_number: str) -> Optional[Dict[str, Any]]:
         """Find a tracker by tracking number in the list.
@@ -166,11 +380,8 @@ class Ship24Client:
         Returns:
             Tracker object if found, None otherwise
         """
-        trackers = await self.get_trackers_list()
-        for tracker in trackers:
-            if tracker.get("trackingNumber") == tracking_number:
-                return tracker
-        return None
+        await self.get_trackers_list()
+        return self._trackers_by_number.get(tracking_number)
 
     async def create_tracker(
         self, tracking_number: str, carrier_code: Optional[str] = None
@@ -184,19 +395,48 @@ class Ship24Client:
         Returns:
             Ship24 API response with tracker data
         """
-        # First check if tracker already exists
-        existing = await self.find_tracker(tracking_number)
-        if existing:
-            _LOGGER.info("Tracker %s already exists, fetching results", tracking_number)
-            # Get full tracking results
-            return await self.get_tracker_results(tracking_number)
-
-        # Create new tracker using /trackers/track endpoint
+        # Optimistic POST: creating directly saves the list fetch that a
+        # find-then-create sequence pays on the common path. If the tracker
+        # already exists, fall back to fetching its results
         data = {"trackingNumber": tracking_number}
         if carrier_code:
             data["courierCode"] = carrier_code
 
-        return await self._request("POST", SHIP24_API_TRACKERS_TRACK_ENDPOINT, data=data)
+        try:
+            result = await self._request("POST", self._track_url, data=data)
+        except aiohttp.ClientResponseError as err:
+            if err.status == 409 or "already" in str(err.message).lower():
+                _LOGGER.info(
+                    "Tracker %s already exists, fetching results", tracking_number
+                )
+                return await self.get_tracker_results(tracking_number)
+            raise
+        self.invalidate_trackers_cache()
+        return result
+
+    async def search_trackers(self, tracking_numbers: List[str]) -> Dict[str, Any]:
+        """Search multiple trackers in a single bulk request.
+
+        Args:
+            tracking_numbers: The tracking numbers to search for
+
+        Returns:
+            Ship24 API response with results for all requested trackers
+        """
+        data = {"trackingNumbers": list(tracking_numbers)}
+        return await self._request("POST", self._search_url, data=data)
+
+    @staticmethod
+    def _results_ttl(response: Dict[str, Any]) -> float:
+        """Pick a cache TTL for a results response based on its milestone."""
+        try:
+            trackings = response.get("data", {}).get("trackings", [])
+            milestone = trackings[0].get("shipment", {}).get("statusMilestone")
+        except (IndexError, AttributeError):
+            milestone = None
+        if milestone == "delivered":
+            return RESULTS_CACHE_TTL_DELIVERED
+        return RESULTS_CACHE_TTL
 
     async def get_tracker_results(self, tracking_number: str) -> Dict[str, Any]:
         """Get tracker results using search endpoint.
@@ -207,8 +447,45 @@ class Ship24Client:
         Returns:
             Ship24 API response with tracking results
         """
-        endpoint = f"{SHIP24_API_TRACKERS_SEARCH_ENDPOINT}/{tracking_number}/results"
-        return await self._request("GET", endpoint)
+        cache = self._results_cache
+        entry = cache.get(tracking_number)
+        if entry is not None:
+            expiry, response = entry
+            if monotonic() < expiry:
+                cache.move_to_end(tracking_number)
+                return response
+            del cache[tracking_number]
+
+        response = await self._request("GET", self._results_url(tracking_number))
+        cache[tracking_number] = (monotonic() + self._results_ttl(response), response)
+        cache.move_to_end(tracking_number)
+        while len(cache) > RESULTS_CACHE_MAX:
+            cache.popitem(last=False)
+        return response
+
+    async def get_tracker_results_bulk(
+        self, tracking_numbers: List[str], concurrency: int = 5
+    ) -> Dict[str, Any]:
+        """Fetch results for several trackers concurrently.
+
+        Args:
+            tracking_numbers: The tracking numbers to fetch
+            concurrency: Maximum number of in-flight requests
+
+        Returns:
+            Mapping of tracking number to its response, or to the exception
+            that the individual fetch raised
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(tracking_number: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.get_tracker_results(tracking_number)
+
+        results = await asyncio.gather(
+            *(_one(n) for n in tracking_numbers), return_exceptions=True
+        )
+        return dict(zip(tracking_numbers, results))
 
     async def get_tracker(self, tracking_number: str) -> Dict[str, Any]:
         """Get tracker data (alias for get_tracker_results).
@@ -231,8 +508,9 @@ class Ship24Client:
             True if successful, False otherwise
         """
         try:
-            endpoint = f"{SHIP24_API_TRACKERS_ENDPOINT}/{tracking_number}"
-            await self._request("DELETE", endpoint)
+            await self._request("DELETE", f"{self._trackers_url}/{tracking_number}")
+            self.invalidate_trackers_cache()
+            self._results_cache.pop(tracking_number, None)
             return True
         except Exception:
             return False
@@ -244,8 +522,15 @@ class Ship24Client:
             True if connection successful, False otherwise
         """
         try:
-            # Try to get trackers list (empty is fine, just testing auth)
-            await self._request("GET", SHIP24_API_TRACKERS_ENDPOINT, params={"limit": 1})
+            # HEAD validates the API key without server-side listing work
+            # or a JSON body; some endpoints reject HEAD, so fall back to
+            # the old cheap GET on 405
+            try:
+                await self._request("HEAD", self._trackers_url, params={"limit": 1})
+            except aiohttp.ClientResponseError as err:
+                if err.status != 405:
+                    raise
+                await self._request("GET", self._trackers_url, params={"limit": 1})
             return True
         except Exception:
             return False
\ No newline at end of file